@@ -2,46 +2,112 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+from collections.abc import Mapping
+from contextlib import AbstractContextManager, nullcontext
+from copy import deepcopy
+from datetime import datetime, timedelta
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from async_timeout import timeout
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_API_VERSION,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_CLOSE,
+    Platform,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from ta_cmi import CMIAPI, ApiError, Device, InvalidCredentialsError, RateLimitError
+from homeassistant.util import dt as dt_util
+from ta_cmi import (
+    CMIAPI,
+    ApiError,
+    CoE,
+    Device,
+    InvalidCredentialsError,
+    RateLimitError,
+)
 
 from .const import (
     _LOGGER,
+    CIRCUIT_BREAKER_PROBE_INTERVAL,
+    CONF_CAPTURE,
+    CONF_CHANNELS,
+    CONF_CHANNELS_DEADBAND,
+    CONF_CHANNELS_ID,
+    CONF_CHANNELS_TYPE,
+    CONF_COE_HOST,
+    CONF_DEADBAND,
+    CONF_DERIVED,
+    CONF_DEVICE_FETCH_MODE,
     CONF_DEVICE_ID,
     CONF_DEVICE_TYPE,
     CONF_DEVICES,
     CONF_SCAN_INTERVAL,
-    DEVICE_DELAY,
+    CONF_STATISTICS_CHANNEL_TYPES,
+    CONF_STATISTICS_ENTITY_MODE,
+    DEVICE_TYPE,
     DOMAIN,
+    PROFILE_PHASE_DISPATCH,
+    PROFILE_PHASE_FETCH,
+    PROFILE_PHASE_PARSE,
     SCAN_INTERVAL,
+    STATISTICS_ENTITY_MODE_ENABLED,
+    TYPE_DERIVED,
 )
 from .device_parser import DeviceParser
+from .snapshot import Snapshot
+
+if TYPE_CHECKING:
+    from .coe_transmit import CoETransmitter
+    from .connection import CMIConnection
+    from .deadband import DeadbandFilter
+    from .derived import DerivedValueEngine
+    from .latency import LatencyTracker
+    from .node_status import NodeStatus
+    from .profiler import CycleProfiler
+    from .rate_limit import CMIScheduler, HostRateLimiter
 
 PLATFORMS: list[str] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-async def custom_sleep(delay: int) -> None:
-    """Custom sleep function to prevent Home Assistant from canceling."""
-    start = time.time()
-    try:
-        await asyncio.sleep(delay)
-    except asyncio.CancelledError:
-        elapsed = time.time() - start
-        _LOGGER.debug(
-            "Sleep cancelled after %s. Sleep remaining time: %s",
-            elapsed,
-            delay - elapsed,
-        )
-        await asyncio.sleep(delay - elapsed)
+# Options that are applied to a running coordinator without a reload.
+HOT_APPLIED_OPTIONS: tuple[str, ...] = (CONF_SCAN_INTERVAL, CONF_DEADBAND)
+
+# Options that entries created before the option existed do not contain.
+OPTION_DEFAULTS: dict[str, Any] = {
+    CONF_STATISTICS_CHANNEL_TYPES: [],
+    CONF_STATISTICS_ENTITY_MODE: STATISTICS_ENTITY_MODE_ENABLED,
+    CONF_CAPTURE: False,
+    CONF_COE_HOST: "",
+    CONF_DEADBAND: False,
+    CONF_DERIVED: [],
+}
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services, the websocket commands and the views of the integration."""
+    # The modules that are only needed once Home Assistant sets up the
+    # integration are not imported with it.
+    from .services import async_setup_services
+    from .websocket import async_setup_websocket
+
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+
+    if hass.http is not None:
+        from .views import async_setup_views
+
+        async_setup_views(hass)
+
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -52,19 +118,78 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     devices: dict[str, Any] = entry.data.get(CONF_DEVICES, [])
 
-    update_interval: timedelta = SCAN_INTERVAL
+    update_interval: timedelta = get_update_interval(entry.data)
+
+    from .connection import CMIConnection
+
+    connection = CMIConnection()
+    entry.async_on_unload(connection.async_close)
+    # The entries are not unloaded when Home Assistant stops.
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, connection.async_close)
+    )
+
+    cmi_api: CMIAPI
+
+    if entry.data.get(CONF_CAPTURE, False):
+        from .capture import CaptureRecorder, RecordingCMIAPI
 
-    if entry.data.get(CONF_SCAN_INTERVAL, None) is not None:
-        update_interval = timedelta(minutes=entry.data.get(CONF_SCAN_INTERVAL))
+        recorder = CaptureRecorder(hass, host)
+        await recorder.async_setup()
+
+        cmi_api = RecordingCMIAPI(
+            host, username, password, connection.session, recorder
+        )
+    else:
+        cmi_api = CMIAPI(host, username, password, connection.session)
 
     coordinator = CMIDataUpdateCoordinator(
-        hass, host, username, password, devices, update_interval
+        hass,
+        host,
+        username,
+        password,
+        devices,
+        update_interval,
+        cmi_api,
+        entry.data.get(CONF_DEADBAND, False),
     )
+    coordinator.connection = connection
+    coordinator.entry_data = deepcopy(dict(entry.data))
+    entry.async_on_unload(coordinator.async_unloaded)
+
+    if coe_host := entry.data.get(CONF_COE_HOST):
+        from .coe_transmit import CoETransmitter
+
+        coordinator.coe_transmitter = CoETransmitter(
+            hass, CoE(coe_host, async_get_clientsession(hass))
+        )
+        entry.async_on_unload(coordinator.coe_transmitter.async_shutdown)
+
+    if derived_configs := entry.data.get(CONF_DERIVED):
+        from .derived import DerivedValueEngine
+
+        coordinator.derived_engine = DerivedValueEngine(derived_configs)
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await coordinator.async_config_entry_first_refresh()
 
+    # The recorder already keeps the statistics of the enabled entities.
+    if (
+        statistics_channel_types := entry.data.get(CONF_STATISTICS_CHANNEL_TYPES)
+    ) and entry.data.get(
+        CONF_STATISTICS_ENTITY_MODE, STATISTICS_ENTITY_MODE_ENABLED
+    ) != STATISTICS_ENTITY_MODE_ENABLED:
+        # The recorder is only loaded if statistics are imported.
+        from .statistics import ChannelStatisticsCollector
+
+        collector = ChannelStatisticsCollector(
+            hass, coordinator, statistics_channel_types
+        )
+        entry.async_on_unload(
+            coordinator.async_add_listener(collector.async_handle_update)
+        )
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -72,14 +197,105 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version > 2:
+        return False
+
+    if entry.version == 1:
+        data: dict[str, Any] = dict(entry.data)
+
+        # The scan interval was stored in minutes.
+        if data.get(CONF_SCAN_INTERVAL, None) is not None:
+            data[CONF_SCAN_INTERVAL] = data[CONF_SCAN_INTERVAL] * 60
+
+        hass.config_entries.async_update_entry(entry, data=data, version=2)
+
+        _LOGGER.debug("Migrated config entry to version %s", entry.version)
+
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, PLATFORMS
+    ):
+        hass.data[DOMAIN].pop(entry.entry_id)
+
+    return unload_ok
 
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    if requires_reload(coordinator.entry_data, entry.data):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator.async_apply_options(entry.data)
+
+
+@callback
+def async_get_host_coordinator(
+    hass: HomeAssistant, host: str
+) -> CMIDataUpdateCoordinator | None:
+    """Return the coordinator of a loaded C.M.I. by its host."""
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if coordinator.host == host:
+            return coordinator
+
+    return None
+
+
+def get_update_interval(entry_data: Mapping[str, Any]) -> timedelta:
+    """Return the configured update interval."""
+    if entry_data.get(CONF_SCAN_INTERVAL, None) is not None:
+        return timedelta(seconds=entry_data[CONF_SCAN_INTERVAL])
+
+    return SCAN_INTERVAL
+
+
+def requires_reload(old: Mapping[str, Any], new: Mapping[str, Any]) -> bool:
+    """Return if a changed configuration can not be applied in place.
+
+    The scan interval, the deadband and the names, device classes and bands of
+    the channels are applied in place, as long as the same channels are fetched.
+    A missing option equals its default.
+    """
+
+    def _without(data: Mapping[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+        return {key: value for key, value in data.items() if key not in keys}
+
+    if _without({**OPTION_DEFAULTS, **old}, (*HOT_APPLIED_OPTIONS, CONF_DEVICES)) != (
+        _without({**OPTION_DEFAULTS, **new}, (*HOT_APPLIED_OPTIONS, CONF_DEVICES))
+    ):
+        return True
+
+    old_devices: list[dict[str, Any]] = old.get(CONF_DEVICES, [])
+    new_devices: list[dict[str, Any]] = new.get(CONF_DEVICES, [])
+
+    if len(old_devices) != len(new_devices):
+        return True
+
+    for old_device, new_device in zip(old_devices, new_devices):
+        if _without(old_device, (CONF_CHANNELS,)) != _without(
+            new_device, (CONF_CHANNELS,)
+        ):
+            return True
+
+        # Only the customized channels are fetched in the defined mode.
+        if new_device.get(CONF_DEVICE_FETCH_MODE) == "defined" and {
+            (channel[CONF_CHANNELS_TYPE], channel[CONF_CHANNELS_ID])
+            for channel in old_device.get(CONF_CHANNELS, [])
+        } != {
+            (channel[CONF_CHANNELS_TYPE], channel[CONF_CHANNELS_ID])
+            for channel in new_device.get(CONF_CHANNELS, [])
+        }:
+            return True
+
+    return False
 
 
 class CMIDataUpdateCoordinator(DataUpdateCoordinator):
@@ -95,19 +311,43 @@ class CMIDataUpdateCoordinator(DataUpdateCoordinator):
         password: str,
         devices: Any,
         update_interval: timedelta,
+        cmi_api: CMIAPI | None = None,
+        deadband_defaults: bool = False,
     ) -> None:
         """Initialize."""
+        # The helpers of the coordinator are loaded once an entry is set up.
+        from .latency import AdaptiveTimeoutAPI, LatencyTracker
+        from .node_status import NodeStatus
+        from .rate_limit import async_get_rate_limiter, async_get_scheduler
+
         self.devices_raw: dict[str, Any] = {}
 
         self.devices: list[Device] = []
         self.host = host
-
-        cmi_api = CMIAPI(host, username, password, async_get_clientsession(hass))
+        self.scheduler: CMIScheduler = async_get_scheduler(hass)
+        self.rate_limiter: HostRateLimiter = async_get_rate_limiter(hass, host)
+        self.device_infos: dict[str, DeviceInfo] = {}
+        self.node_status: dict[str, NodeStatus] = {}
+        self.deadband_filters: dict[str, DeadbandFilter] = {}
+        self.connection: CMIConnection | None = None
+        self.coe_transmitter: CoETransmitter | None = None
+        self.profiler: CycleProfiler | None = None
+        self.derived_engine: DerivedValueEngine | None = None
+        self.entry_data: dict[str, Any] = {}
+        self.cycles: int = 0
+        self.last_cycle_duration: float | None = None
+        self._unload_listeners: list[CALLBACK_TYPE] = []
+
+        if cmi_api is None:
+            cmi_api = CMIAPI(host, username, password, async_get_clientsession(hass))
+
+        self.latency: dict[str, LatencyTracker] = {}
+        api = AdaptiveTimeoutAPI(cmi_api, self.latency)
 
         for dev_raw in devices:
             device_id: str = dev_raw[CONF_DEVICE_ID]
             device: Device = Device(
-                device_id, cmi_api, CMIDataUpdateCoordinator._coe_sleep_function
+                device_id, api, CMIDataUpdateCoordinator._coe_sleep_function
             )
 
             if CONF_DEVICE_TYPE in dev_raw:
@@ -115,39 +355,306 @@ class CMIDataUpdateCoordinator(DataUpdateCoordinator):
 
             self.devices.append(device)
             self.devices_raw[device_id] = dev_raw
+            self.node_status[device_id] = NodeStatus()
+            self.latency[device_id] = LatencyTracker()
+            self._setup_deadband_filter(device_id, dev_raw, deadband_defaults)
 
         _LOGGER.debug("Used update interval: %s", update_interval)
 
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Update data."""
-        try:
-            return_data: dict[str, Any] = {}
-            for device in self.devices:
-                _LOGGER.debug("Try to update device: %s", device.id)
+    def _setup_deadband_filter(
+        self, device_id: str, dev_raw: dict[str, Any], deadband_defaults: bool
+    ) -> None:
+        """Create the deadband filter of a node if a band applies to it."""
+        self.deadband_filters.pop(device_id, None)
+
+        if deadband_defaults or any(
+            CONF_CHANNELS_DEADBAND in channel
+            for channel in dev_raw.get(CONF_CHANNELS, [])
+        ):
+            # The filter is only loaded if a band applies to the node.
+            from .deadband import DeadbandFilter
+
+            self.deadband_filters[device_id] = DeadbandFilter.from_device_config(
+                dev_raw, deadband_defaults
+            )
 
-                async with timeout((DEVICE_DELAY * 2) + 5):
-                    await device.update()
+    @callback
+    def async_add_unload_listener(self, unload_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for the unload of the config entry and return a function to stop."""
+        self._unload_listeners.append(unload_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the unload listener."""
+            if unload_callback in self._unload_listeners:
+                self._unload_listeners.remove(unload_callback)
 
-                parser: DeviceParser = DeviceParser(device, self.devices_raw[device.id])
+        return remove_listener
 
-                return_data[device.id] = parser.parse()
+    @callback
+    def async_unloaded(self) -> None:
+        """Notify the listeners that the coordinator does not update anymore."""
+        listeners: list[CALLBACK_TYPE] = self._unload_listeners
+        self._unload_listeners = []
 
-                return_data[device.id][CONF_HOST] = self.host
+        for unload_callback in listeners:
+            unload_callback()
 
-                if len(self.devices) != 1:
+    @callback
+    def async_apply_options(self, entry_data: Mapping[str, Any]) -> None:
+        """Apply the scan interval and the channel customizations in place."""
+        self.entry_data = deepcopy(dict(entry_data))
+
+        update_interval: timedelta = get_update_interval(entry_data)
+
+        if update_interval != self.update_interval:
+            _LOGGER.debug("Used update interval: %s", update_interval)
+            self.update_interval = update_interval
+
+            # A running update schedules the next one with the new interval.
+            if self._unsub_refresh is not None:
+                self._schedule_refresh()
+
+        for dev_raw in entry_data.get(CONF_DEVICES, []):
+            device_id: str = dev_raw[CONF_DEVICE_ID]
+
+            self.devices_raw[device_id] = dev_raw
+            self._setup_deadband_filter(
+                device_id, dev_raw, entry_data.get(CONF_DEADBAND, False)
+            )
+
+        if self.data is None:
+            return
+
+        data: dict[str, Any] = dict(self.data)
+
+        for device in self.devices:
+            if device.id in data:
+                data[device.id] = DeviceParser(
+                    device, self.devices_raw[device.id]
+                ).customize(data[device.id])
+
+        self.data = self.data.evolve(data)
+        self.async_update_listeners()
+
+    async def _async_update_data(self) -> Snapshot:
+        """Update data."""
+        start: float = time.monotonic()
+
+        try:
+            return await self._async_update_nodes()
+        finally:
+            self.cycles += 1
+            self.last_cycle_duration = time.monotonic() - start
+
+    async def _async_update_nodes(self) -> Snapshot:
+        """Update all nodes and return the next snapshot."""
+        return_data: dict[str, Any] = {}
+        last_error: Exception | None = None
+        retry_devices: list[Device] = []
+
+        for device in self.devices:
+            _LOGGER.debug("Try to update device: %s", device.id)
+
+            status: NodeStatus = self.node_status[device.id]
+
+            if not status.should_poll():
+                _LOGGER.debug(
+                    "Skip node %s after %s failed updates",
+                    device.id,
+                    status.consecutive_failures,
+                )
+                self._keep_last_data(return_data, device.id)
+                continue
+
+            try:
+                await self._async_update_node(device, return_data)
+            except TimeoutError as err:
+                if self.latency[device.id].should_retry():
                     _LOGGER.debug(
-                        f"Sleep mode for {DEVICE_DELAY} seconds to prevent rate limiting"
+                        "Request to node %s timed out. Retry at the end of the update",
+                        device.id,
                     )
-                    await custom_sleep(DEVICE_DELAY)
+                    retry_devices.append(device)
+                    continue
 
-            return return_data
-        except (InvalidCredentialsError, RateLimitError, ApiError) as err:
+                last_error = self._handle_node_failure(device.id, return_data, err)
+            except (RateLimitError, ApiError) as err:
+                last_error = self._handle_node_failure(device.id, return_data, err)
+
+        for device in retry_devices:
+            try:
+                await self._async_update_node(device, return_data)
+            except (RateLimitError, ApiError, TimeoutError) as err:
+                last_error = self._handle_node_failure(device.id, return_data, err)
+
+        # The entities are created from the first data, so every node has to answer.
+        if self.data is None and last_error is not None:
+            raise UpdateFailed(last_error) from last_error
+
+        if not any(status.available for status in self.node_status.values()):
+            if last_error is None:
+                raise UpdateFailed("All nodes are waiting for their next attempt")
+            raise UpdateFailed(last_error) from last_error
+
+        return self._evolve_snapshot(return_data)
+
+    def _evolve_snapshot(self, nodes: dict[str, Any]) -> Snapshot:
+        """Create the next snapshot that shares the unchanged nodes with the last one."""
+        return (self.data or Snapshot()).evolve(nodes)
+
+    def _profile(self, phase: str) -> AbstractContextManager[None]:
+        """Profile a phase of the update while a profiling is running."""
+        if self.profiler is None:
+            return nullcontext()
+
+        return self.profiler.phase(phase)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        with self._profile(PROFILE_PHASE_DISPATCH):
+            super().async_update_listeners()
+
+    async def _async_update_node(
+        self, device: Device, return_data: dict[str, Any]
+    ) -> None:
+        """Request and parse the data of a node."""
+        try:
+            async with self.scheduler.async_request(self.rate_limiter):
+                with self._profile(PROFILE_PHASE_FETCH):
+                    await device.update()
+        except InvalidCredentialsError as err:
             _LOGGER.warning("Update failed with error: %s", str(err))
-            _LOGGER.debug(
-                "Waiting %s seconds to prevent retrying with an rate limit error",
-                DEVICE_DELAY,
-            )
-            await custom_sleep(DEVICE_DELAY)
             raise UpdateFailed(err) from err
+
+        self.node_status[device.id].mark_success()
+
+        parser: DeviceParser = DeviceParser(
+            device, self.devices_raw[device.id], self.deadband_filters.get(device.id)
+        )
+
+        with self._profile(PROFILE_PHASE_PARSE):
+            return_data[device.id] = parser.parse()
+
+            if self.derived_engine is not None:
+                return_data[device.id][TYPE_DERIVED] = self.derived_engine.process(
+                    device.id, return_data[device.id], time.monotonic()
+                )
+
+        return_data[device.id][CONF_HOST] = self.host
+
+        self._update_device_info(device.id, return_data[device.id])
+
+    @callback
+    def async_request_node_refresh(self, node_id: str) -> tuple[int, datetime]:
+        """Queue the update of a single node.
+
+        Returns the position in the queue of the host and the expected time
+        when the new data is applied.
+        """
+        device: Device = next(device for device in self.devices if device.id == node_id)
+
+        position: int = self.rate_limiter.queued
+        expected_duration: float = self.rate_limiter.estimate_wait() + (
+            self.latency[node_id].percentile or 0
+        )
+
+        self.hass.async_create_background_task(
+            self._async_refresh_node(device), f"{DOMAIN} refresh node {node_id}"
+        )
+
+        return position, dt_util.utcnow() + timedelta(seconds=expected_duration)
+
+    async def _async_refresh_node(self, device: Device) -> None:
+        """Update a single node and apply its data right away."""
+        node_data: dict[str, Any] = {}
+
+        try:
+            await self._async_update_node(device, node_data)
+        except (RateLimitError, ApiError, TimeoutError, UpdateFailed) as err:
+            self._handle_node_failure(device.id, node_data, err)
+
+        # An update cycle may have finished while the request was queued, so
+        # only the refreshed node is applied to the current data.
+        data: dict[str, Any] = dict(self.data or {})
+        data.update(node_data)
+
+        # The schedule of the regular updates is kept.
+        self.data = self._evolve_snapshot(data)
+        self.async_update_listeners()
+
+    def _handle_node_failure(
+        self, node_id: str, return_data: dict[str, Any], err: Exception
+    ) -> Exception:
+        """Record the failed update of a node and keep its last data."""
+        _LOGGER.warning("Update of node %s failed with error: %s", node_id, str(err))
+
+        status: NodeStatus = self.node_status[node_id]
+        status.mark_failure(err)
+
+        if isinstance(err, RateLimitError):
+            status.rate_limit_hits += 1
+
+        if status.circuit_open:
+            _LOGGER.warning(
+                "Node %s failed %s times in a row. Only checking it every %s seconds",
+                node_id,
+                status.consecutive_failures,
+                CIRCUIT_BREAKER_PROBE_INTERVAL,
+            )
+
+        self._keep_last_data(return_data, node_id)
+
+        return err
+
+    def _keep_last_data(self, return_data: dict[str, Any], node_id: str) -> None:
+        """Keep the last known data so the entities of the node still exist."""
+        if self.data is not None and node_id in self.data:
+            return_data[node_id] = self.data[node_id]
+
+    def is_node_available(self, node_id: str) -> bool:
+        """Return if the last update of a node was successful."""
+        status: NodeStatus | None = self.node_status.get(node_id)
+
+        return status is None or status.available
+
+    def _update_device_info(self, node_id: str, node_data: dict[str, Any]) -> None:
+        """Build the device info of a node if the device details changed."""
+        device_name: str = node_data[DEVICE_TYPE]
+        device_api_type: str = node_data[CONF_API_VERSION]
+
+        device_info: DeviceInfo | None = self.device_infos.get(node_id)
+
+        if (
+            device_info is not None
+            and device_info["name"] == device_name
+            and device_info["sw_version"] == device_api_type
+        ):
+            return
+
+        self.device_infos[node_id] = DeviceInfo(
+            name=device_name,
+            identifiers={(DOMAIN, self.host, node_id)},
+            manufacturer="Technische Alternative",
+            model=device_name,
+            sw_version=device_api_type,
+        )
+
+        if device_info is None:
+            return
+
+        # The entities only read their device info when they are added.
+        device_registry = dr.async_get(self.hass)
+
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, self.host, node_id)}
+        ):
+            device_registry.async_update_device(
+                device.id,
+                name=device_name,
+                model=device_name,
+                sw_version=device_api_type,
+            )
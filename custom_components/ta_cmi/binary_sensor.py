@@ -1,31 +1,21 @@
 """C.M.I binary sensor platform."""
 from __future__ import annotations
 
-from typing import Any
-
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    ATTR_IDENTIFIERS,
-    ATTR_MANUFACTURER,
-    ATTR_MODEL,
-    ATTR_NAME,
-    ATTR_SW_VERSION,
-    CONF_API_VERSION,
-    CONF_HOST,
-)
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from ta_cmi import ChannelType
 from . import CMIDataUpdateCoordinator
-from .const import DEVICE_TYPE, DOMAIN, NEW_UID, TYPE_BINARY, _LOGGER
+from .const import DOMAIN, NEW_UID, TYPE_BINARY, _LOGGER
+from .device_parser import ChannelData
 
 
 async def async_setup_entry(
@@ -53,8 +43,7 @@ async def async_setup_entry(
             available_channels = coordinator.data[ent][TYPE_BINARY][channel_type.name]
             for ch_id in available_channels:
                 channel: DeviceChannelBinary = DeviceChannelBinary(
-                    coordinator, ent, ch_id, channel_type.name, entry_id,
-                    (DOMAIN, coordinator.data[ent][CONF_HOST], ent)
+                    coordinator, ent, ch_id, channel_type.name, entry_id
                 )
 
                 entities.append(channel)
@@ -65,12 +54,8 @@ async def async_setup_entry(
 
         device_registry.async_get_or_create(
             config_entry_id=config_entry.entry_id,
-            identifiers={(DOMAIN, coordinator.data[ent][CONF_HOST], ent)},
-            manufacturer="Technische Alternative",
-            name=coordinator.data[ent][DEVICE_TYPE],
-            model=coordinator.data[ent][DEVICE_TYPE],
-            sw_version=coordinator.data[ent][CONF_API_VERSION],
             configuration_url=coordinator.data[ent][CONF_HOST],
+            **coordinator.device_infos[ent],
         )
 
     async_add_entities(entities)
@@ -86,7 +71,6 @@ class DeviceChannelBinary(CoordinatorEntity, BinarySensorEntity):
             channel_id: str,
             input_type: ChannelType,
             entry_id: str | None,
-            device_id: tuple[str, str, str],
     ) -> None:
         """Initialize."""
         super().__init__(coordinator)
@@ -94,16 +78,13 @@ class DeviceChannelBinary(CoordinatorEntity, BinarySensorEntity):
         self._node_id = node_id
         self._input_type = input_type
         self._coordinator = coordinator
-        self._device_id = device_id
+        self._attr_device_info = coordinator.device_infos[node_id]
 
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
+        channel_raw: ChannelData = self._coordinator.data[self._node_id][
             TYPE_BINARY
         ][self._input_type][self._id]
 
-        name: str = channel_raw["name"]
-        mode: str = channel_raw["mode"]
-
-        self._attr_name: str = name or f"Node: {self._node_id} - {mode} {self._id}"
+        mode: str = channel_raw.mode
 
         if entry_id:
             self._attr_unique_id: str = (
@@ -112,37 +93,55 @@ class DeviceChannelBinary(CoordinatorEntity, BinarySensorEntity):
         else:
             self._attr_unique_id: str = f"ta-cmi-{self._node_id}-{mode}{self._id}"
 
+        self._last_attributes: tuple | None = None
+        self._last_version: tuple[int, bool] | None = None
+        self._update_attributes()
+
     @property
-    def is_on(self) -> bool:
-        """Return the state of the sensor."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
-            TYPE_BINARY
-        ][self._input_type][self._id]
+    def available(self) -> bool:
+        """Return if the entity and its node are available."""
+        return super().available and self._coordinator.is_node_available(
+            self._node_id
+        )
 
-        value: str = channel_raw["value"]
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        # The attributes only change with the data or the availability of the node.
+        version = (
+            self._coordinator.data.node_version(self._node_id),
+            self.available,
+        )
 
-        return value in ("on", "yes", 1)
+        if version == self._last_version:
+            return
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
+        self._last_version = version
 
-        device_api_type: str = self._coordinator.data[self._node_id][CONF_API_VERSION]
-        device_name: str = self._coordinator.data[self._node_id][DEVICE_TYPE]
+        if self._update_attributes():
+            self.async_write_ha_state()
 
-        return {
-            ATTR_NAME: device_name,
-            ATTR_IDENTIFIERS: {self._device_id},
-            ATTR_MANUFACTURER: "Technische Alternative",
-            ATTR_MODEL: device_name,
-            ATTR_SW_VERSION: device_api_type,
-        }
-
-    @property
-    def device_class(self) -> BinarySensorDeviceClass | None:
-        """Return the device class of this entity, if any."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
+    def _update_attributes(self) -> bool:
+        """Update the entity attributes and return if something changed."""
+        channel_raw: ChannelData = self._coordinator.data[self._node_id][
             TYPE_BINARY
         ][self._input_type][self._id]
 
-        return channel_raw.get("device_class", None)
+        is_on: bool = channel_raw.value in ("on", "yes", 1)
+        device_class: BinarySensorDeviceClass | None = channel_raw.device_class
+        name: str = (
+            channel_raw.name or f"Node: {self._node_id} - {channel_raw.mode} {self._id}"
+        )
+
+        attributes = (is_on, device_class, name, self.available)
+
+        if attributes == self._last_attributes:
+            return False
+
+        self._last_attributes = attributes
+
+        self._attr_is_on = is_on
+        self._attr_device_class = device_class
+        self._attr_name = name
+
+        return True
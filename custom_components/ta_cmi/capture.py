@@ -0,0 +1,241 @@
+"""Record and replay the C.M.I. API traffic to reproduce problems offline."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import gzip
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+from ta_cmi import CMIAPI, ApiError, RateLimitError
+import yarl
+
+from . import CMIDataUpdateCoordinator
+from .const import _LOGGER, CAPTURE_SLOTS, CONF_DEVICE_ID, DOMAIN
+from .rate_limit import HostRateLimiter
+
+CAPTURE_SUFFIX = ".json.gz"
+
+
+def _redact_host(host: str) -> str:
+    """Remove credentials that are part of the host url."""
+    url = yarl.URL(host)
+
+    if url.user is None and url.password is None:
+        return host
+
+    return str(url.with_user(None))
+
+
+class CaptureRecorder:
+    """Write the API responses into a ring buffer on disk."""
+
+    def __init__(
+        self, hass: HomeAssistant, host: str, slots: int = CAPTURE_SLOTS
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.host = _redact_host(host)
+        self.slots = slots
+        self.path = Path(hass.config.path(DOMAIN, "captures", slugify(self.host)))
+
+        self._next_slot = 0
+
+    async def async_setup(self) -> None:
+        """Create the capture directory and find the next free slot."""
+        self._next_slot = await self.hass.async_add_executor_job(self._find_next_slot)
+
+    def _find_next_slot(self) -> int:
+        """Return the slot after the newest capture."""
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        captures = list(self.path.glob(f"*{CAPTURE_SUFFIX}"))
+
+        if not captures:
+            return 0
+
+        newest = max(captures, key=lambda capture: capture.stat().st_mtime)
+
+        return (int(newest.name.removesuffix(CAPTURE_SUFFIX)) + 1) % self.slots
+
+    async def async_record(
+        self,
+        node_id: str,
+        parameter: str,
+        start: float,
+        duration: float,
+        response: dict[str, Any] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Store a request and its response in the next slot."""
+        capture: dict[str, Any] = {
+            "host": self.host,
+            "node": node_id,
+            "parameter": parameter,
+            "timestamp": start,
+            "duration": duration,
+        }
+
+        if error is not None:
+            capture["error"] = type(error).__name__
+            capture["message"] = str(error)
+        else:
+            capture["response"] = response
+
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+
+        try:
+            await self.hass.async_add_executor_job(self._write, slot, capture)
+        except OSError as err:
+            _LOGGER.warning("Could not write the capture: %s", err)
+
+    def _write(self, slot: int, capture: dict[str, Any]) -> None:
+        """Write a capture into a slot."""
+        data = json.dumps(capture, separators=(",", ":")).encode()
+        (self.path / f"{slot:04d}{CAPTURE_SUFFIX}").write_bytes(gzip.compress(data))
+
+
+class RecordingCMIAPI(CMIAPI):
+    """CMI API that records every device request."""
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        session: ClientSession,
+        recorder: CaptureRecorder,
+    ) -> None:
+        """Initialize."""
+        super().__init__(host, username, password, session)
+        self._recorder = recorder
+
+    async def get_device_data(self, node_id: str, parameter: str) -> dict[str, Any]:
+        """Get data from device and record the response."""
+        start = time.time()
+
+        try:
+            response = await super().get_device_data(node_id, parameter)
+        except (ApiError, RateLimitError) as err:
+            await self._recorder.async_record(
+                node_id, parameter, start, time.time() - start, error=err
+            )
+            raise
+
+        await self._recorder.async_record(
+            node_id, parameter, start, time.time() - start, response=response
+        )
+
+        return response
+
+
+def load_captures(path: Path) -> list[dict[str, Any]]:
+    """Load all captures of a directory ordered by the time of the request."""
+    captures: list[dict[str, Any]] = [
+        json.loads(gzip.decompress(capture.read_bytes()))
+        for capture in path.glob(f"*{CAPTURE_SUFFIX}")
+    ]
+
+    return sorted(captures, key=lambda capture: capture["timestamp"])
+
+
+class ReplayCMIAPI(CMIAPI):
+    """CMI API that answers the device requests from captures."""
+
+    def __init__(self, captures: list[dict[str, Any]], realtime: bool = False) -> None:
+        """Initialize."""
+        super().__init__(captures[0]["host"] if captures else "", "", "")
+
+        self._captures: dict[str, list[dict[str, Any]]] = {}
+        for capture in captures:
+            self._captures.setdefault(capture["node"], []).append(capture)
+
+        self._realtime = realtime
+        self._first_timestamp: float | None = (
+            captures[0]["timestamp"] if captures else None
+        )
+        self._replay_start: float | None = None
+
+    def has_pending(self) -> bool:
+        """Return if there are captures left to replay."""
+        return any(self._captures.values())
+
+    @property
+    def pending(self) -> int:
+        """Return the number of captures left to replay."""
+        return sum(len(captures) for captures in self._captures.values())
+
+    async def get_device_data(self, node_id: str, parameter: str) -> dict[str, Any]:
+        """Return the next captured response of a node."""
+        pending = self._captures.get(node_id)
+
+        if not pending:
+            raise ApiError("Node not available")
+
+        capture = pending.pop(0)
+
+        if self._realtime:
+            await self._async_wait_for(capture)
+
+        if "error" in capture:
+            if capture["error"] == RateLimitError.__name__:
+                raise RateLimitError(capture["message"])
+            raise ApiError(capture["message"])
+
+        return capture["response"]
+
+    async def _async_wait_for(self, capture: dict[str, Any]) -> None:
+        """Wait until the capture is due compared to the start of the replay."""
+        if self._replay_start is None:
+            self._replay_start = time.monotonic()
+
+        due = capture["timestamp"] + capture["duration"] - self._first_timestamp
+        remaining = due - (time.monotonic() - self._replay_start)
+
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+
+async def async_replay_captures(
+    hass: HomeAssistant,
+    path: Path,
+    devices: list[dict[str, Any]],
+    realtime: bool = False,
+) -> list[dict[str, Any]]:
+    """Feed captures through the coordinator and return every snapshot."""
+    captures = await hass.async_add_executor_job(load_captures, path)
+
+    # Captures of nodes that are not configured would never be requested.
+    node_ids: set[str] = {device[CONF_DEVICE_ID] for device in devices}
+    api = ReplayCMIAPI(
+        [capture for capture in captures if capture["node"] in node_ids], realtime
+    )
+
+    coordinator = CMIDataUpdateCoordinator(
+        hass, api.host, "", "", devices, timedelta(minutes=10), cmi_api=api
+    )
+    # The pacing is done by the captures, not by the rate limit.
+    coordinator.rate_limiter = HostRateLimiter(api.host, delay=0)
+
+    snapshots: list[dict[str, Any]] = []
+    while api.has_pending():
+        pending: int = api.pending
+
+        await coordinator.async_refresh()
+        snapshots.append(coordinator.data)
+
+        if api.pending == pending:
+            _LOGGER.warning("Replay stopped, %s captures were not requested", pending)
+            break
+
+        # Failed nodes are retried right away, otherwise the backoff stalls the replay.
+        for status in coordinator.node_status.values():
+            status.next_attempt = 0
+
+    return snapshots
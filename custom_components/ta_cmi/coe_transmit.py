@@ -0,0 +1,154 @@
+"""Send values to the CAN network through the CoE server."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from aiohttp import ClientError
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from ta_cmi import ApiError, ChannelMode, CoE, CoEChannel
+
+from .const import _LOGGER, COE_RETRY_BASE, COE_RETRY_MAX, COE_SEND_INTERVAL
+
+
+class CoETransmitter:
+    """Coalesce the values for the CAN network and send them in batches.
+
+    Values written between two sends to the CoE server are sent together with
+    one frame per mode, a newer value of a channel replaces the pending one and
+    values that equal the last sent value are dropped. Values of a failed send
+    are retried with an increasing delay.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coe: CoE, send_interval: float = COE_SEND_INTERVAL
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.send_interval = send_interval
+
+        self.frames_sent = 0
+        self.values_sent = 0
+        self.values_skipped = 0
+
+        self._coe = coe
+        self._pending: dict[ChannelMode, dict[int, tuple[Any, str]]] = {
+            mode: {} for mode in ChannelMode
+        }
+        self._last_sent: dict[ChannelMode, dict[int, tuple[Any, str]]] = {
+            mode: {} for mode in ChannelMode
+        }
+        self._last_send: float = 0
+        self._retry_at: float = 0
+        self._consecutive_failures = 0
+        self._unsub_send: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_queue(
+        self, mode: ChannelMode, index: int, value: float, unit: str
+    ) -> None:
+        """Queue a value for the next send."""
+        if mode == ChannelMode.DIGITAL:
+            value = bool(value)
+
+        if self._last_sent[mode].get(index) == (value, unit):
+            self._pending[mode].pop(index, None)
+            self.values_skipped += 1
+            return
+
+        self._pending[mode][index] = (value, unit)
+        self._async_schedule_send()
+
+    @callback
+    def _async_schedule_send(self) -> None:
+        """Schedule the next send to the CoE server within the send interval."""
+        if self._unsub_send is not None:
+            return
+
+        delay = max(
+            0.0,
+            self._last_send + self.send_interval - time.monotonic(),
+            self._retry_at - time.monotonic(),
+        )
+
+        self._unsub_send = async_call_later(self.hass, delay, self._async_send)
+
+    async def _async_send(self, _now: Any = None) -> None:
+        """Send the pending values of all modes."""
+        self._unsub_send = None
+        self._last_send = time.monotonic()
+
+        failed: bool = False
+
+        for mode in ChannelMode:
+            if not await self._async_send_mode(mode):
+                failed = True
+
+        if not failed:
+            self._consecutive_failures = 0
+            self._retry_at = 0
+            return
+
+        self._consecutive_failures += 1
+        self._retry_at = self._last_send + min(
+            COE_RETRY_MAX, COE_RETRY_BASE * 2 ** (self._consecutive_failures - 1)
+        )
+        self._async_schedule_send()
+
+    async def _async_send_mode(self, mode: ChannelMode) -> bool:
+        """Send all pending values of a mode in one request.
+
+        Returns False if the values could not be sent.
+        """
+        pending = self._pending[mode]
+        self._pending[mode] = {}
+
+        if not pending:
+            return True
+
+        channels: list[CoEChannel] = [
+            CoEChannel(mode, index, value, unit)
+            for index, (value, unit) in sorted(pending.items())
+        ]
+
+        try:
+            if mode == ChannelMode.ANALOG:
+                await self._coe.send_analog_values_v2(channels)
+            else:
+                await self._coe.send_digital_values_v2(channels)
+        except (ApiError, ClientError, TimeoutError) as err:
+            _LOGGER.warning("Could not send the values to the CoE server: %s", err)
+
+            # The values are sent with the next frame, unless they were replaced.
+            for index, pending_value in pending.items():
+                self._pending[mode].setdefault(index, pending_value)
+            return False
+
+        self._last_sent[mode].update(pending)
+        self.frames_sent += 1
+        self.values_sent += len(channels)
+
+        return True
+
+    async def async_shutdown(self) -> None:
+        """Send the pending values and stop the scheduled send."""
+        if self._unsub_send is not None:
+            self._unsub_send()
+            await self._async_send()
+
+        # Values that still could not be sent are not retried anymore.
+        if self._unsub_send is not None:
+            self._unsub_send()
+            self._unsub_send = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Represent the transmitter as a dictionary."""
+        return {
+            "frames_sent": self.frames_sent,
+            "values_sent": self.values_sent,
+            "values_skipped": self.values_skipped,
+            "pending": {
+                mode.name: len(pending) for mode, pending in self._pending.items()
+            },
+        }
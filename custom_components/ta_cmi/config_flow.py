@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import time
 from copy import deepcopy
-from datetime import timedelta
 from typing import Any
 from urllib.parse import urlparse
 
@@ -22,24 +21,55 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from ta_cmi import CMI, ApiError, Device, InvalidCredentialsError, RateLimitError
-from . import custom_sleep
 from .const import (
     _LOGGER,
+    CONF_CAPTURE,
     CONF_CHANNELS,
+    CONF_CHANNELS_DEADBAND,
     CONF_CHANNELS_DEVICE_CLASS,
     CONF_CHANNELS_ID,
     CONF_CHANNELS_NAME,
     CONF_CHANNELS_TYPE,
+    CONF_COE_HOST,
+    CONF_DEADBAND,
+    CONF_DERIVED,
+    CONF_DERIVED_CHANNEL_ID,
+    CONF_DERIVED_CHANNEL_TYPE,
+    CONF_DERIVED_FUNCTION,
+    CONF_DERIVED_ID,
+    CONF_DERIVED_NAME,
+    CONF_DERIVED_NODE,
+    CONF_DERIVED_SECOND_CHANNEL_ID,
+    CONF_DERIVED_SECOND_CHANNEL_TYPE,
+    CONF_DERIVED_WINDOW,
     CONF_DEVICE_FETCH_MODE,
     CONF_DEVICE_ID,
     CONF_DEVICE_TYPE,
     CONF_DEVICES,
     CONF_SCAN_INTERVAL,
+    CONF_STATISTICS_CHANNEL_TYPES,
+    CONF_STATISTICS_ENTITY_MODE,
+    DERIVED_FUNCTION_DIFFERENCE,
+    DERIVED_FUNCTION_MAX,
+    DERIVED_FUNCTION_MEAN,
+    DERIVED_FUNCTION_MIN,
+    DERIVED_FUNCTION_RATE,
+    DERIVED_MAX_WINDOW,
+    DERIVED_WINDOW,
     DEVICE_DELAY,
     DEVICE_TYPE_STRING_MAP,
     DOMAIN,
+    MAX_SCAN_INTERVAL,
     NEW_UID,
     SCAN_INTERVAL,
+    STATISTICS_ENTITY_MODE_DISABLED,
+    STATISTICS_ENTITY_MODE_ENABLED,
+    STATISTICS_ENTITY_MODE_NONE,
+)
+from .rate_limit import (
+    async_get_rate_limiter,
+    custom_sleep,
+    get_minimum_scan_interval,
 )
 
 
@@ -98,7 +128,7 @@ def extract_hostname(url: str) -> str | None:
 class ConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Technische Alternative C.M.I.."""
 
-    VERSION = 1
+    VERSION = 2
     override_data: dict[str, Any] = {}
     override_config: dict[str, Any] = {}
     init_start_time: float = 0
@@ -263,6 +293,11 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                         CONF_CHANNELS_DEVICE_CLASS
                     ]
 
+                    if user_input.get(CONF_CHANNELS_DEADBAND) is not None:
+                        channel[CONF_CHANNELS_DEADBAND] = user_input[
+                            CONF_CHANNELS_DEADBAND
+                        ]
+
                     dev[CONF_CHANNELS].append(channel)
                     break
 
@@ -288,6 +323,9 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                     ),
                     vol.Required(CONF_CHANNELS_NAME): cv.string,
                     vol.Optional(CONF_CHANNELS_DEVICE_CLASS, default=""): cv.string,
+                    vol.Optional(CONF_CHANNELS_DEADBAND): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
                     vol.Optional("edit_more_channels", default=True): cv.boolean,
                 }
             ),
@@ -296,11 +334,10 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     async def async_step_finish(self) -> ConfigFlowResult:
         """Step for save the config."""
-        # Wait to prevent rate limiting from being triggered.
-        end_time = time.time()
-        time_lapsed = end_time - self.start_time
-        if time_lapsed <= DEVICE_DELAY:
-            await custom_sleep(int(DEVICE_DELAY - time_lapsed))
+        # The first request of the coordinator waits for the rate limit instead.
+        async_get_rate_limiter(
+            self.hass, self.config.get(CONF_HOST, "")
+        ).register_request(self.start_time)
 
         hostname = extract_hostname(self.config.get(CONF_HOST, "")) or "C.M.I."
         return self.async_create_entry(title=hostname, data=self.config)
@@ -314,20 +351,62 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         return OptionsFlowHandler(config_entry)
 
 
-def get_schema(config: dict[str, Any], device_count: int) -> vol.Schema:
+def get_schema(config: dict[str, Any], min_interval: int) -> vol.Schema:
     """Generate the schema."""
 
-    default_interval: timedelta = SCAN_INTERVAL
+    default_interval: int = int(SCAN_INTERVAL.total_seconds())
 
     if config.get(CONF_SCAN_INTERVAL, None) is not None:
-        default_interval = timedelta(minutes=config.get(CONF_SCAN_INTERVAL))
+        default_interval = config[CONF_SCAN_INTERVAL]
 
     return vol.Schema(
         {
             vol.Required(CONF_HOST, default=config.get(CONF_HOST, "")): cv.string,
             vol.Required(
-                CONF_SCAN_INTERVAL, default=default_interval.seconds / 60
-            ): vol.All(int, vol.Range(min=device_count + 1, max=60)),
+                CONF_SCAN_INTERVAL, default=max(default_interval, min_interval)
+            ): vol.All(
+                vol.Coerce(int), vol.Range(min=min_interval, max=MAX_SCAN_INTERVAL)
+            ),
+            vol.Optional(
+                CONF_STATISTICS_CHANNEL_TYPES,
+                default=config.get(CONF_STATISTICS_CHANNEL_TYPES, []),
+            ): cv.multi_select(
+                {x: x.title() for x in DEVICE_TYPE_STRING_MAP.values()}
+            ),
+            vol.Optional(
+                CONF_STATISTICS_ENTITY_MODE,
+                default=config.get(
+                    CONF_STATISTICS_ENTITY_MODE, STATISTICS_ENTITY_MODE_ENABLED
+                ),
+            ): vol.In(
+                {
+                    STATISTICS_ENTITY_MODE_ENABLED: "Create entities",
+                    STATISTICS_ENTITY_MODE_DISABLED: "Create disabled entities",
+                    STATISTICS_ENTITY_MODE_NONE: "Only statistics",
+                }
+            ),
+            vol.Optional(
+                CONF_CAPTURE, default=config.get(CONF_CAPTURE, False)
+            ): cv.boolean,
+            vol.Optional(
+                CONF_COE_HOST, default=config.get(CONF_COE_HOST, "")
+            ): cv.string,
+            vol.Optional(
+                CONF_DEADBAND, default=config.get(CONF_DEADBAND, False)
+            ): cv.boolean,
+            vol.Optional(
+                CONF_DERIVED,
+                default=[
+                    str(derived[CONF_DERIVED_ID])
+                    for derived in config.get(CONF_DERIVED, [])
+                ],
+            ): cv.multi_select(
+                {
+                    str(derived[CONF_DERIVED_ID]): derived[CONF_DERIVED_NAME]
+                    for derived in config.get(CONF_DERIVED, [])
+                }
+            ),
+            vol.Optional("add_derived", default=False): cv.boolean,
         }
     )
 
@@ -348,6 +427,26 @@ class OptionsFlowHandler(OptionsFlow):
 
         if user_input is not None and not errors:
             self.data[CONF_SCAN_INTERVAL] = user_input[CONF_SCAN_INTERVAL]
+            self.data[CONF_STATISTICS_CHANNEL_TYPES] = user_input.get(
+                CONF_STATISTICS_CHANNEL_TYPES, []
+            )
+            self.data[CONF_STATISTICS_ENTITY_MODE] = user_input.get(
+                CONF_STATISTICS_ENTITY_MODE, STATISTICS_ENTITY_MODE_ENABLED
+            )
+            self.data[CONF_CAPTURE] = user_input.get(CONF_CAPTURE, False)
+
+            coe_host: str = user_input.get(CONF_COE_HOST, "").strip()
+            if coe_host and not coe_host.startswith("http://"):
+                coe_host = "http://" + coe_host
+            self.data[CONF_COE_HOST] = coe_host
+            self.data[CONF_DEADBAND] = user_input.get(CONF_DEADBAND, False)
+
+            kept_derived: list[str] = user_input.get(CONF_DERIVED, [])
+            self.data[CONF_DERIVED] = [
+                derived
+                for derived in self.data.get(CONF_DERIVED, [])
+                if str(derived[CONF_DERIVED_ID]) in kept_derived
+            ]
 
             if user_input[CONF_HOST] != self.data[CONF_HOST]:
                 if not user_input[CONF_HOST].startswith("http://"):
@@ -366,19 +465,103 @@ class OptionsFlowHandler(OptionsFlow):
                     errors["base"] = "unknown"
                 else:
                     self.data[CONF_HOST] = user_input[CONF_HOST]
-                    self.hass.config_entries.async_update_entry(
-                        self.config_entry, data=self.data
-                    )
-                    return self.async_create_entry(title="", data={})
+                    return await self._async_save(user_input.get("add_derived", False))
             else:
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, data=self.data
-                )
-                return self.async_create_entry(title="", data={})
+                return await self._async_save(user_input.get("add_derived", False))
 
         return self.async_show_form(
             step_id="init",
-            data_schema=get_schema(self.data, len(self.data.get(CONF_DEVICES, {}))),
+            data_schema=get_schema(
+                self.data, get_minimum_scan_interval(self.data.get(CONF_DEVICES, []))
+            ),
+            errors=errors,
+        )
+
+    async def _async_save(self, add_derived: bool) -> ConfigFlowResult:
+        """Save the options or continue with a new derived value."""
+        if add_derived:
+            return await self.async_step_derived()
+
+        self.hass.config_entries.async_update_entry(self.config_entry, data=self.data)
+        return self.async_create_entry(title="", data={})
+
+    async def async_step_derived(
+            self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Step to add a derived value."""
+        errors: dict[str, Any] = {}
+
+        if user_input is not None:
+            function: str = user_input[CONF_DERIVED_FUNCTION]
+            has_second_channel: bool = (
+                user_input.get(CONF_DERIVED_SECOND_CHANNEL_TYPE) is not None
+                and user_input.get(CONF_DERIVED_SECOND_CHANNEL_ID) is not None
+            )
+
+            if function == DERIVED_FUNCTION_DIFFERENCE and not has_second_channel:
+                errors["base"] = "second_channel_required"
+            else:
+                derived_list: list[dict[str, Any]] = self.data.get(CONF_DERIVED, [])
+
+                derived: dict[str, Any] = {
+                    CONF_DERIVED_ID: max(
+                        (item[CONF_DERIVED_ID] for item in derived_list), default=0
+                    )
+                    + 1,
+                    CONF_DERIVED_NAME: user_input[CONF_DERIVED_NAME],
+                    CONF_DERIVED_FUNCTION: function,
+                    CONF_DERIVED_NODE: user_input[CONF_DERIVED_NODE],
+                    CONF_DERIVED_CHANNEL_TYPE: user_input[
+                        CONF_DERIVED_CHANNEL_TYPE
+                    ].lower(),
+                    CONF_DERIVED_CHANNEL_ID: user_input[CONF_DERIVED_CHANNEL_ID],
+                    CONF_DERIVED_WINDOW: user_input[CONF_DERIVED_WINDOW],
+                }
+
+                if function == DERIVED_FUNCTION_DIFFERENCE:
+                    derived[CONF_DERIVED_SECOND_CHANNEL_TYPE] = user_input[
+                        CONF_DERIVED_SECOND_CHANNEL_TYPE
+                    ].lower()
+                    derived[CONF_DERIVED_SECOND_CHANNEL_ID] = user_input[
+                        CONF_DERIVED_SECOND_CHANNEL_ID
+                    ]
+
+                self.data[CONF_DERIVED] = [*derived_list, derived]
+
+                return await self._async_save(user_input["add_more_derived"])
+
+        channel_types: list[str] = [x.title() for x in DEVICE_TYPE_STRING_MAP.values()]
+        channel_id = vol.All(vol.Coerce(int), vol.Range(min=1))
+
+        return self.async_show_form(
+            step_id="derived",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DERIVED_NAME): cv.string,
+                    vol.Required(CONF_DERIVED_FUNCTION): vol.In(
+                        [
+                            DERIVED_FUNCTION_DIFFERENCE,
+                            DERIVED_FUNCTION_RATE,
+                            DERIVED_FUNCTION_MIN,
+                            DERIVED_FUNCTION_MAX,
+                            DERIVED_FUNCTION_MEAN,
+                        ]
+                    ),
+                    vol.Required(CONF_DERIVED_NODE): vol.In(
+                        [dev[CONF_DEVICE_ID] for dev in self.data.get(CONF_DEVICES, [])]
+                    ),
+                    vol.Required(CONF_DERIVED_CHANNEL_TYPE): vol.In(channel_types),
+                    vol.Required(CONF_DERIVED_CHANNEL_ID): channel_id,
+                    vol.Optional(CONF_DERIVED_SECOND_CHANNEL_TYPE): vol.In(
+                        channel_types
+                    ),
+                    vol.Optional(CONF_DERIVED_SECOND_CHANNEL_ID): channel_id,
+                    vol.Optional(CONF_DERIVED_WINDOW, default=DERIVED_WINDOW): vol.All(
+                        vol.Coerce(int), vol.Range(min=2, max=DERIVED_MAX_WINDOW)
+                    ),
+                    vol.Optional("add_more_derived", default=False): cv.boolean,
+                }
+            ),
             errors=errors,
         )
 
@@ -0,0 +1,164 @@
+"""HTTP connection to a C.M.I. with request timings."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+    TraceRequestEndParams,
+    TraceRequestStartParams,
+    TraceResponseChunkReceivedParams,
+)
+
+from .const import (
+    CONNECTION_DNS_CACHE_TTL,
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_TIMING_SAMPLES,
+)
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Timings of a single request in seconds."""
+
+    timestamp: float
+    url: str
+    connect: float | None = None
+    first_byte: float | None = None
+    total: float | None = None
+    reused_connection: bool = False
+
+
+class CMIConnection:
+    """Own the HTTP session of a C.M.I. and record the request timings.
+
+    The C.M.I. can only handle one connection at a time, so the connector is
+    limited to a single connection per host that is kept alive between the
+    requests.
+    """
+
+    def __init__(self, samples: int = CONNECTION_TIMING_SAMPLES) -> None:
+        """Initialize."""
+        self.timings: deque[RequestTiming] = deque(maxlen=samples)
+        self.requests = 0
+        self.reused_connections = 0
+
+        self._session: ClientSession | None = None
+
+    @property
+    def session(self) -> ClientSession:
+        """Return the session, created on first use."""
+        if self._session is None or self._session.closed:
+            connector = TCPConnector(
+                limit_per_host=1,
+                keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+                use_dns_cache=True,
+                ttl_dns_cache=CONNECTION_DNS_CACHE_TTL,
+            )
+            self._session = ClientSession(
+                connector=connector, trace_configs=[self._create_trace_config()]
+            )
+
+        return self._session
+
+    async def async_close(self, _event: Any = None) -> None:
+        """Close the session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _create_trace_config(self) -> TraceConfig:
+        """Create the trace hooks that measure the requests."""
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_response_chunk_received.append(
+            self._on_response_chunk_received
+        )
+
+        return trace_config
+
+    async def _on_request_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        """Start the timing of a request."""
+        context.start = time.monotonic()
+        context.timing = RequestTiming(
+            timestamp=time.time(), url=str(params.url.with_query(None))
+        )
+
+        self.timings.append(context.timing)
+        self.requests += 1
+
+    async def _on_connection_create_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        """Record the time to open a new connection."""
+        context.timing.connect = time.monotonic() - context.start
+
+    async def _on_connection_reuseconn(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        """Record that a kept alive connection was used."""
+        context.timing.reused_connection = True
+        self.reused_connections += 1
+
+    async def _on_request_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        """Record the time until the response headers arrived."""
+        context.timing.first_byte = time.monotonic() - context.start
+        context.timing.total = context.timing.first_byte
+
+    async def _on_response_chunk_received(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceResponseChunkReceivedParams,
+    ) -> None:
+        """Record the time until the body was read."""
+        context.timing.total = time.monotonic() - context.start
+
+    def as_dict(self) -> dict[str, Any]:
+        """Represent the timings as a dictionary."""
+        return {
+            "requests": self.requests,
+            "reused_connections": self.reused_connections,
+            "average": {
+                key: _average(getattr(timing, key) for timing in self.timings)
+                for key in ("connect", "first_byte", "total")
+            },
+            "timings": [asdict(timing) for timing in self.timings],
+        }
+
+
+def _average(values: Any) -> float | None:
+    """Return the average of the known values."""
+    known: list[float] = [value for value in values if value is not None]
+
+    if not known:
+        return None
+
+    return sum(known) / len(known)
@@ -6,17 +6,77 @@ from logging import Logger, getLogger
 
 from homeassistant.components.sensor import SensorDeviceClass
 from ta_cmi import ChannelType
+from ta_cmi.const import DEVICES, SUPPORTED_PARAMS_FOR_DEVICE
 
 _LOGGER: Logger = getLogger(__package__)
 
 SCAN_INTERVAL: timedelta = timedelta(minutes=10)
 DEVICE_DELAY: int = 75
+MAX_CONCURRENT_REQUESTS: int = 4
+MAX_SCAN_INTERVAL: int = 60 * 60
+
+# ta_cmi fetches more parameters of a device than this with two requests.
+MAX_PARAMS_PER_REQUEST: int = 7
+
+# Device types whose parameters ta_cmi fetches with two requests.
+DEVICE_TYPE_REQUESTS: dict[str, int] = {
+    DEVICES[device_id]: 2
+    for device_id, params in SUPPORTED_PARAMS_FOR_DEVICE.items()
+    if len(params.split(",")) > MAX_PARAMS_PER_REQUEST
+}
+
+NODE_BACKOFF_BASE: int = 60
+NODE_BACKOFF_MAX: int = 30 * 60
+NODE_BACKOFF_JITTER: float = 0.2
+CIRCUIT_BREAKER_THRESHOLD: int = 5
+CIRCUIT_BREAKER_PROBE_INTERVAL: int = 6 * 60 * 60
+
+LATENCY_SAMPLES: int = 100
+LATENCY_MIN_SAMPLES: int = 10
+LATENCY_PERCENTILE: float = 0.99
+LATENCY_TIMEOUT_FACTOR: float = 3
+LATENCY_TIMEOUT_FLOOR: float = 5
+LATENCY_TIMEOUT_CEILING: float = 60
+
+DIAGNOSTICS_MAX_VALUES: int = 50000
+
+CAPTURE_SLOTS: int = 500
+
+COE_SEND_INTERVAL: float = 1
+COE_RETRY_BASE: float = 5
+COE_RETRY_MAX: float = 5 * 60
+
+DERIVED_WINDOW: int = 12
+DERIVED_MAX_WINDOW: int = 1000
+DERIVED_RATE_PERIOD: int = 60 * 60
+
+PROFILE_MAX_CYCLES: int = 10
+PROFILE_TOP_FUNCTIONS: int = 25
+PROFILE_PHASE_FETCH: str = "fetch"
+PROFILE_PHASE_PARSE: str = "parse"
+PROFILE_PHASE_DISPATCH: str = "dispatch"
+
+# The C.M.I. is requested at most every DEVICE_DELAY seconds.
+CONNECTION_KEEPALIVE_TIMEOUT: int = DEVICE_DELAY + 15
+CONNECTION_DNS_CACHE_TTL: int = 5 * 60
+CONNECTION_TIMING_SAMPLES: int = 50
 
 DOMAIN: str = "ta_cmi"
 
+DATA_SCHEDULER: str = f"{DOMAIN}_scheduler"
+
 DEVICE_TYPE: str = "device_type"
 
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_CAPTURE: str = "capture"
+CONF_COE_HOST: str = "coe_host"
+CONF_DEADBAND: str = "deadband_filter"
+CONF_STATISTICS_CHANNEL_TYPES: str = "statistics_channel_types"
+CONF_STATISTICS_ENTITY_MODE: str = "statistics_entity_mode"
+
+STATISTICS_ENTITY_MODE_ENABLED: str = "enabled"
+STATISTICS_ENTITY_MODE_DISABLED: str = "disabled"
+STATISTICS_ENTITY_MODE_NONE: str = "none"
 
 CONF_DEVICES: str = "devices"
 CONF_DEVICE_ID: str = "id"
@@ -28,6 +88,24 @@ CONF_CHANNELS_TYPE: str = "type"
 CONF_CHANNELS_ID: str = "id"
 CONF_CHANNELS_NAME: str = "name"
 CONF_CHANNELS_DEVICE_CLASS: str = "device_class"
+CONF_CHANNELS_DEADBAND: str = "deadband"
+
+CONF_DERIVED: str = "derived"
+CONF_DERIVED_ID: str = "derived_id"
+CONF_DERIVED_NAME: str = "name"
+CONF_DERIVED_FUNCTION: str = "function"
+CONF_DERIVED_NODE: str = "node"
+CONF_DERIVED_CHANNEL_TYPE: str = "channel_type"
+CONF_DERIVED_CHANNEL_ID: str = "channel_id"
+CONF_DERIVED_SECOND_CHANNEL_TYPE: str = "second_channel_type"
+CONF_DERIVED_SECOND_CHANNEL_ID: str = "second_channel_id"
+CONF_DERIVED_WINDOW: str = "window"
+
+DERIVED_FUNCTION_DIFFERENCE: str = "difference"
+DERIVED_FUNCTION_RATE: str = "rate"
+DERIVED_FUNCTION_MIN: str = "min"
+DERIVED_FUNCTION_MAX: str = "max"
+DERIVED_FUNCTION_MEAN: str = "mean"
 
 
 DEFAULT_DEVICE_CLASS_MAP: dict[str, SensorDeviceClass] = {
@@ -58,8 +136,25 @@ DEFAULT_DEVICE_CLASS_MAP: dict[str, SensorDeviceClass] = {
     "W/m²": SensorDeviceClass.IRRADIANCE,
 }
 
+DEADBAND_MAX_AGE: int = 60 * 60
+
+# Absolute and relative band of the values that are not published.
+DEADBAND_DEFAULTS: dict[SensorDeviceClass, tuple[float, float]] = {
+    SensorDeviceClass.TEMPERATURE: (0.2, 0),
+    SensorDeviceClass.HUMIDITY: (1, 0),
+    SensorDeviceClass.PRESSURE: (0, 0.01),
+    SensorDeviceClass.POWER: (0, 0.02),
+    SensorDeviceClass.CURRENT: (0, 0.02),
+    SensorDeviceClass.VOLTAGE: (0, 0.01),
+    SensorDeviceClass.FREQUENCY: (0, 0.01),
+    SensorDeviceClass.SPEED: (0, 0.05),
+    SensorDeviceClass.ILLUMINANCE: (0, 0.05),
+    SensorDeviceClass.IRRADIANCE: (0, 0.05),
+}
+
 TYPE_BINARY = "binary"
 TYPE_SENSOR = "sensor"
+TYPE_DERIVED = "derived"
 
 DEVICE_TYPE_STRING_MAP: dict[ChannelType, str] = {
     ChannelType.INPUT: "input",
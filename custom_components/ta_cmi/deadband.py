@@ -0,0 +1,114 @@
+"""Deadband filter for the noisy values of the C.M.I. channels."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+
+from .const import (
+    CONF_CHANNELS,
+    CONF_CHANNELS_DEADBAND,
+    CONF_CHANNELS_ID,
+    CONF_CHANNELS_TYPE,
+    DEADBAND_DEFAULTS,
+    DEADBAND_MAX_AGE,
+    DEFAULT_DEVICE_CLASS_MAP,
+    DEVICE_TYPE_STRING_MAP,
+)
+
+
+class DeadbandFilter:
+    """Hold the published value of a channel until it leaves its band.
+
+    A band is either configured for the channel or taken from the device
+    class of the channel. A value is published anyway once the last published
+    value is older than the max age.
+    """
+
+    def __init__(
+        self,
+        channel_deadbands: dict[tuple[str, int], float],
+        use_defaults: bool = False,
+        max_age: float = DEADBAND_MAX_AGE,
+    ) -> None:
+        """Initialize."""
+        self.channel_deadbands = channel_deadbands
+        self.use_defaults = use_defaults
+        self.max_age = max_age
+
+        self._published: dict[tuple[str, int], tuple[float, float]] = {}
+
+    @classmethod
+    def from_device_config(
+        cls, device_raw: dict[str, Any], use_defaults: bool = False
+    ) -> DeadbandFilter:
+        """Create the filter of a node from its channel configuration."""
+        type_names: dict[str, str] = {
+            type_string: channel_type.name
+            for channel_type, type_string in DEVICE_TYPE_STRING_MAP.items()
+        }
+
+        channel_deadbands: dict[tuple[str, int], float] = {
+            (type_names[channel[CONF_CHANNELS_TYPE]], channel[CONF_CHANNELS_ID]): (
+                channel[CONF_CHANNELS_DEADBAND]
+            )
+            for channel in device_raw.get(CONF_CHANNELS, [])
+            if channel.get(CONF_CHANNELS_DEADBAND) is not None
+            and channel[CONF_CHANNELS_TYPE] in type_names
+        }
+
+        return cls(channel_deadbands, use_defaults)
+
+    def _get_band(
+        self, key: tuple[str, int], unit: str, device_class: str | None
+    ) -> tuple[float, float] | None:
+        """Return the absolute and relative band of a channel."""
+        if key in self.channel_deadbands:
+            return self.channel_deadbands[key], 0
+
+        if not self.use_defaults:
+            return None
+
+        if device_class is None:
+            device_class = DEFAULT_DEVICE_CLASS_MAP.get(unit)
+
+        try:
+            return DEADBAND_DEFAULTS.get(SensorDeviceClass(device_class))
+        except ValueError:
+            return None
+
+    def filter(
+        self,
+        key: tuple[str, int],
+        value: Any,
+        unit: str,
+        device_class: str | None,
+        now: float | None = None,
+    ) -> Any:
+        """Return the value to publish for a channel."""
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            return value
+
+        band = self._get_band(key, unit, device_class)
+
+        if band is None:
+            return value
+
+        if now is None:
+            now = time.monotonic()
+
+        published = self._published.get(key)
+
+        if published is not None and now - published[1] < self.max_age:
+            absolute, relative = band
+            published_value = published[0]
+
+            if abs(value - published_value) <= max(
+                absolute, relative * abs(published_value)
+            ):
+                return published_value
+
+        self._published[key] = (value, now)
+
+        return value
@@ -0,0 +1,279 @@
+"""Values derived from the channels of the C.M.I. nodes."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CONF_DERIVED_CHANNEL_ID,
+    CONF_DERIVED_CHANNEL_TYPE,
+    CONF_DERIVED_FUNCTION,
+    CONF_DERIVED_ID,
+    CONF_DERIVED_NAME,
+    CONF_DERIVED_NODE,
+    CONF_DERIVED_SECOND_CHANNEL_ID,
+    CONF_DERIVED_SECOND_CHANNEL_TYPE,
+    CONF_DERIVED_WINDOW,
+    DEFAULT_DEVICE_CLASS_MAP,
+    DERIVED_FUNCTION_DIFFERENCE,
+    DERIVED_FUNCTION_MAX,
+    DERIVED_FUNCTION_MEAN,
+    DERIVED_FUNCTION_MIN,
+    DERIVED_FUNCTION_RATE,
+    DERIVED_RATE_PERIOD,
+    DERIVED_WINDOW,
+    DEVICE_TYPE_STRING_MAP,
+    TYPE_SENSOR,
+)
+from .device_parser import ChannelData
+
+DERIVED_MODE: str = "Derived"
+
+
+class RingBuffer:
+    """Keep the latest values of a channel with the time they were fetched."""
+
+    __slots__ = ("size", "count", "_times", "_values", "_next")
+
+    def __init__(self, size: int) -> None:
+        """Initialize."""
+        self.size = size
+        self.count = 0
+
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a value and drop the oldest one if the buffer is full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+
+        if self.count < self.size:
+            self.count += 1
+
+    def _index(self, age: int) -> int:
+        """Return the position of a value, age 0 is the latest value."""
+        return (self._next - 1 - age) % self.size
+
+    def latest(self) -> float | None:
+        """Return the latest value."""
+        if not self.count:
+            return None
+
+        return self._values[self._index(0)]
+
+    def window(self, samples: int) -> Iterator[float]:
+        """Iterate over the latest values, newest first."""
+        for age in range(min(samples, self.count)):
+            yield self._values[self._index(age)]
+
+    def first_and_last(
+        self, samples: int
+    ) -> tuple[tuple[float, float], tuple[float, float]] | None:
+        """Return the oldest and the latest timestamp and value of a window."""
+        samples = min(samples, self.count)
+
+        if samples < 2:
+            return None
+
+        first: int = self._index(samples - 1)
+        last: int = self._index(0)
+
+        return (
+            (self._times[first], self._values[first]),
+            (self._times[last], self._values[last]),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DerivedValue:
+    """Configuration of a value that is derived from channels of a node."""
+
+    derived_id: int
+    name: str
+    function: str
+    node_id: str
+    channel: tuple[str, int]
+    second_channel: tuple[str, int] | None
+    window: int
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> DerivedValue:
+        """Create the derived value from its configuration."""
+        type_names: dict[str, str] = {
+            type_string: channel_type.name
+            for channel_type, type_string in DEVICE_TYPE_STRING_MAP.items()
+        }
+
+        second_channel: tuple[str, int] | None = None
+
+        if config.get(CONF_DERIVED_SECOND_CHANNEL_TYPE) is not None:
+            second_channel = (
+                type_names[config[CONF_DERIVED_SECOND_CHANNEL_TYPE]],
+                config[CONF_DERIVED_SECOND_CHANNEL_ID],
+            )
+
+        return cls(
+            config[CONF_DERIVED_ID],
+            config[CONF_DERIVED_NAME],
+            config[CONF_DERIVED_FUNCTION],
+            config[CONF_DERIVED_NODE],
+            (
+                type_names[config[CONF_DERIVED_CHANNEL_TYPE]],
+                config[CONF_DERIVED_CHANNEL_ID],
+            ),
+            second_channel,
+            config.get(CONF_DERIVED_WINDOW, DERIVED_WINDOW),
+        )
+
+    @property
+    def channels(self) -> tuple[tuple[str, int], ...]:
+        """Return the channels the value is derived from."""
+        if self.second_channel is None:
+            return (self.channel,)
+
+        return self.channel, self.second_channel
+
+
+class DerivedValueEngine:
+    """Buffer the values of the used channels and compute the derived values.
+
+    Every channel that a derived value uses gets one ring buffer that is sized
+    for the largest window, so the values of a cycle are only stored once.
+    """
+
+    def __init__(self, derived_configs: list[dict[str, Any]]) -> None:
+        """Initialize."""
+        self.derived: dict[str, list[DerivedValue]] = {}
+        self.buffers: dict[str, dict[tuple[str, int], RingBuffer]] = {}
+
+        sizes: dict[str, dict[tuple[str, int], int]] = {}
+
+        for config in derived_configs:
+            derived: DerivedValue = DerivedValue.from_config(config)
+            self.derived.setdefault(derived.node_id, []).append(derived)
+
+            node_sizes = sizes.setdefault(derived.node_id, {})
+
+            for channel in derived.channels:
+                node_sizes[channel] = max(node_sizes.get(channel, 2), derived.window)
+
+        for node_id, node_sizes in sizes.items():
+            self.buffers[node_id] = {
+                channel: RingBuffer(size) for channel, size in node_sizes.items()
+            }
+
+    def process(
+        self, node_id: str, node_data: dict[str, Any], timestamp: float
+    ) -> dict[int, ChannelData]:
+        """Add the parsed values of a node and compute its derived values."""
+        derived_values: list[DerivedValue] = self.derived.get(node_id, [])
+
+        if not derived_values:
+            return {}
+
+        buffers: dict[tuple[str, int], RingBuffer] = self.buffers[node_id]
+        sensors: dict[str, Any] = node_data[TYPE_SENSOR]
+
+        for (type_name, channel_id), buffer in buffers.items():
+            channel_data: ChannelData | None = sensors.get(type_name, {}).get(
+                channel_id
+            )
+
+            if channel_data is None:
+                continue
+
+            value = channel_data.value
+
+            if isinstance(value, bool) or not isinstance(value, int | float):
+                continue
+
+            buffer.append(timestamp, float(value))
+
+        result: dict[int, ChannelData] = {}
+
+        for derived in derived_values:
+            source: ChannelData | None = sensors.get(derived.channel[0], {}).get(
+                derived.channel[1]
+            )
+            unit: str = source.unit if source is not None else ""
+
+            if derived.function == DERIVED_FUNCTION_RATE and unit:
+                unit = f"{unit}/h"
+
+            result[derived.derived_id] = ChannelData(
+                self._compute(derived, buffers),
+                DERIVED_MODE,
+                unit,
+                derived.name,
+                self._get_device_class(derived, source),
+            )
+
+        return result
+
+    @staticmethod
+    def _compute(
+        derived: DerivedValue, buffers: dict[tuple[str, int], RingBuffer]
+    ) -> float | None:
+        """Compute a derived value from the buffered values."""
+        buffer: RingBuffer = buffers[derived.channel]
+
+        if derived.function == DERIVED_FUNCTION_DIFFERENCE:
+            first = buffer.latest()
+            second = buffers[derived.second_channel].latest()
+
+            if first is None or second is None:
+                return None
+
+            return round(first - second, 6)
+
+        if derived.function == DERIVED_FUNCTION_RATE:
+            window = buffer.first_and_last(derived.window)
+
+            if window is None or window[1][0] <= window[0][0]:
+                return None
+
+            (first_time, first_value), (last_time, last_value) = window
+
+            return round(
+                (last_value - first_value)
+                / (last_time - first_time)
+                * DERIVED_RATE_PERIOD,
+                6,
+            )
+
+        if not buffer.count:
+            return None
+
+        if derived.function == DERIVED_FUNCTION_MIN:
+            return min(buffer.window(derived.window))
+
+        if derived.function == DERIVED_FUNCTION_MAX:
+            return max(buffer.window(derived.window))
+
+        if derived.function == DERIVED_FUNCTION_MEAN:
+            samples = min(derived.window, buffer.count)
+            return round(sum(buffer.window(samples)) / samples, 6)
+
+        return None
+
+    @staticmethod
+    def _get_device_class(
+        derived: DerivedValue, source: ChannelData | None
+    ) -> str | None:
+        """Return the device class of a derived value.
+
+        Differences and rates do not measure the same quantity as their channel,
+        e.g. a temperature difference must not be converted like a temperature.
+        """
+        if source is None or derived.function in (
+            DERIVED_FUNCTION_DIFFERENCE,
+            DERIVED_FUNCTION_RATE,
+        ):
+            return None
+
+        return source.device_class or DEFAULT_DEVICE_CLASS_MAP.get(source.unit)
@@ -1,7 +1,8 @@
 """Parser to parse device data."""
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from homeassistant.const import CONF_API_VERSION, STATE_OFF, STATE_ON
 
@@ -19,17 +20,38 @@ from .const import (
     TYPE_SENSOR,
 )
 
+if TYPE_CHECKING:
+    from .deadband import DeadbandFilter
+
+
+class ChannelData(NamedTuple):
+    """Parsed value and metadata of a channel."""
+
+    value: Any
+    mode: str
+    unit: str
+    name: str | None
+    device_class: str | None
+
 
 class DeviceParser:
     """Class to parse a devices."""
 
-    def __init__(self, device: Device, device_raw: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        device: Device,
+        device_raw: dict[str, Any],
+        deadband_filter: DeadbandFilter | None = None,
+    ) -> None:
         """Initialize."""
         self.device = device
         self.device_raw = device_raw
+        self.deadband_filter = deadband_filter
 
         self.fetch_mode: str = device_raw[CONF_DEVICE_FETCH_MODE]
-        self.channel_options: list = self._parse_channel_options()
+        self.channel_options: dict[
+            tuple[str, int], tuple[str | None, str | None]
+        ] = self._parse_channel_options()
 
     def parse(self) -> dict[str, Any]:
         """Parse the device."""
@@ -50,18 +72,40 @@ class DeviceParser:
 
         return data
 
-    def _parse_channel_options(self) -> list:
-        """Parse the channel options."""
-        options: list = []
+    def customize(self, node_data: Mapping[str, Any]) -> dict[str, Any]:
+        """Return a copy of parsed data with the current channel customizations."""
+        data: dict[str, Any] = dict(node_data)
+
+        for sensor_type in (TYPE_BINARY, TYPE_SENSOR):
+            data[sensor_type] = {}
+
+            for type_name, channels in node_data[sensor_type].items():
+                channel_type: ChannelType = ChannelType[type_name]
+                data[sensor_type][type_name] = {}
+
+                for channel_id, channel_data in channels.items():
+                    name, device_class = self._get_channel_customization(
+                        channel_id, channel_type
+                    )
+                    data[sensor_type][type_name][channel_id] = channel_data._replace(
+                        name=name, device_class=device_class
+                    )
+
+        return data
+
+    def _parse_channel_options(
+        self,
+    ) -> dict[tuple[str, int], tuple[str | None, str | None]]:
+        """Index the channel options by channel type and id."""
+        options: dict[tuple[str, int], tuple[str | None, str | None]] = {}
 
         for channel in self.device_raw[CONF_CHANNELS]:
-            options.append(
-                {
-                    CONF_CHANNELS_ID: channel[CONF_CHANNELS_ID],
-                    CONF_CHANNELS_TYPE: channel[CONF_CHANNELS_TYPE],
-                    CONF_CHANNELS_NAME: channel[CONF_CHANNELS_NAME],
-                    CONF_CHANNELS_DEVICE_CLASS: channel[CONF_CHANNELS_DEVICE_CLASS],
-                }
+            options.setdefault(
+                (channel[CONF_CHANNELS_TYPE], channel[CONF_CHANNELS_ID]),
+                (
+                    channel[CONF_CHANNELS_NAME],
+                    channel[CONF_CHANNELS_DEVICE_CLASS] or None,
+                ),
             )
 
         return options
@@ -70,19 +114,9 @@ class DeviceParser:
             self, channel_id: int, channel_type: ChannelType
     ) -> tuple[str | None, str | None]:
         """Get the channel customization."""
-        name = None
-        device_class = None
-
-        for i in self.channel_options:
-            if channel_id == i[CONF_CHANNELS_ID] and i[
-                CONF_CHANNELS_TYPE
-            ] == DEVICE_TYPE_STRING_MAP.get(channel_type, ""):
-                name = i[CONF_CHANNELS_NAME]
-                if len(i[CONF_CHANNELS_DEVICE_CLASS]) != 0:
-                    device_class = i[CONF_CHANNELS_DEVICE_CLASS]
-                break
-
-        return name, device_class
+        return self.channel_options.get(
+            (DEVICE_TYPE_STRING_MAP.get(channel_type, ""), channel_id), (None, None)
+        )
 
     @staticmethod
     def _format_input(target_channel: Channel) -> tuple[str, str]:
@@ -126,6 +160,8 @@ class DeviceParser:
         # Dict structure
         # SENSOR_TYPE CHANNEL_TYPE CHANNEL_ID
 
+        mode: str = self._format_channel_type(channel_type)
+
         for channel_id in target_channels:
             name, device_class = self._get_channel_customization(
                 channel_id, channel_type
@@ -145,17 +181,16 @@ class DeviceParser:
 
             if self._is_channel_binary(channel):
                 sensor_type: str = TYPE_BINARY
+            elif self.deadband_filter is not None:
+                value = self.deadband_filter.filter(
+                    (channel_type.name, channel_id), value, unit, device_class
+                )
 
             if base_data[sensor_type].get(channel_type.name, None) is None:
                 base_data[sensor_type][channel_type.name] = {}
 
-            base_data[sensor_type][channel_type.name][channel_id] = {
-                "channel": channel,
-                "value": value,
-                "mode": self._format_channel_type(channel_type),
-                "unit": unit,
-                "name": name,
-                "device_class": device_class,
-            }
+            base_data[sensor_type][channel_type.name][channel_id] = ChannelData(
+                value, mode, unit, name, device_class
+            )
 
         return base_data
@@ -1,5 +1,7 @@
 """Diagnostics support for the Technische Alternative C.M.I. integration."""
-from copy import deepcopy
+from __future__ import annotations
+
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -9,7 +11,8 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry, DeviceRegistry
 
 from . import CMIDataUpdateCoordinator
-from .const import CONF_DEVICES, CONF_SCAN_INTERVAL, DOMAIN
+from .const import CONF_DEVICES, CONF_SCAN_INTERVAL, DIAGNOSTICS_MAX_VALUES, DOMAIN
+from .device_parser import ChannelData
 
 
 async def async_get_config_entry_diagnostics(
@@ -35,62 +38,123 @@ def _async_get_diagnostics(
     """Return diagnostics for a config entry."""
     coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
     device_registry = dr.async_get(hass)
+    budget = _SerializationBudget(DIAGNOSTICS_MAX_VALUES)
 
     data = {
         "host": entry.data[CONF_HOST],
-        "update_interval": entry.data[CONF_SCAN_INTERVAL],
+        "update_interval": entry.data.get(CONF_SCAN_INTERVAL),
         "disabled_by": entry.disabled_by,
         "disabled_polling": entry.pref_disable_polling,
         "device_config": entry.data[CONF_DEVICES],
+        "node_status": {
+            node_id: status.as_dict()
+            for node_id, status in coordinator.node_status.items()
+        },
+        "latency": {
+            node_id: tracker.as_dict()
+            for node_id, tracker in coordinator.latency.items()
+        },
+        "connection": (
+            coordinator.connection.as_dict() if coordinator.connection else None
+        ),
+        "coe": (
+            coordinator.coe_transmitter.as_dict()
+            if coordinator.coe_transmitter
+            else None
+        ),
     }
 
     if device:
-        device_id = next(iter(device.identifiers))[1]
-        data |= _async_device_as_dict(hass, device_registry, coordinator, device_id)
+        device_id = next(iter(device.identifiers))[-1]
+        data |= _async_device_as_dict(
+            device_registry, coordinator, device_id, budget
+        )
     else:
         data.update(
             devices=[
-                _async_device_as_dict(hass, device_registry, coordinator, device_id)
+                _async_device_as_dict(
+                    device_registry, coordinator, device_id, budget
+                )
                 for device_id in coordinator.data.keys()
             ]
         )
 
+    data["truncated"] = budget.exhausted
+
     return data
 
 
 @callback
 def _async_device_as_dict(
-    hass: HomeAssistant,
     device_registry: DeviceRegistry,
     coordinator: CMIDataUpdateCoordinator,
     device_id: str,
+    budget: _SerializationBudget,
 ) -> dict[str, Any]:
     """Represent a device as a dictionary."""
 
-    device = device_registry.async_get_device(identifiers={(DOMAIN, device_id)})
-
-    last_state = deepcopy(coordinator.data[device_id])
-    remove_channel_from_dict(last_state)
+    device = device_registry.async_get_device(
+        identifiers={(DOMAIN, coordinator.host, device_id)}
+    )
 
     # Base device information, without sensitive information.
     data = {
-        "name": device.name,
-        "model": device.model if hasattr(device, "model") else None,
-        "sw_version": device.sw_version,
-        "configuration_url": device.configuration_url,
-        "state": last_state,
+        "name": device.name if device else None,
+        "model": device.model if device else None,
+        "sw_version": device.sw_version if device else None,
+        "configuration_url": device.configuration_url if device else None,
+        "state": _serialize(coordinator.data.get(device_id, {}), budget),
     }
 
     return data
 
 
-def remove_channel_from_dict(d: dict[str, Any]):
-    if isinstance(d, list):
-        for i in d:
-            remove_channel_from_dict(i)
-    elif isinstance(d, dict):
-        for k, v in d.copy().items():
-            if k == "channel":
-                d.pop(k)
-            else:
-                remove_channel_from_dict(v)
+class _SerializationBudget:
+    """Limit the number of values in the diagnostics."""
+
+    def __init__(self, max_values: int) -> None:
+        """Initialize."""
+        self.remaining = max_values
+        self.exhausted = False
+
+    def take(self) -> bool:
+        """Take one value from the budget."""
+        if self.remaining <= 0:
+            self.exhausted = True
+            return False
+
+        self.remaining -= 1
+        return True
+
+
+def _serialize(value: Any, budget: _SerializationBudget) -> Any:
+    """Build the output for a value of the snapshot without copying it first."""
+    if isinstance(value, ChannelData):
+        value = value._asdict()
+
+    if isinstance(value, Mapping):
+        result: dict[Any, Any] = {}
+
+        for key, item in value.items():
+            if not budget.take():
+                break
+
+            result[key] = _serialize(item, budget)
+
+        return result
+
+    if isinstance(value, list | tuple):
+        items: list[Any] = []
+
+        for item in value:
+            if not budget.take():
+                break
+
+            items.append(_serialize(item, budget))
+
+        return items
+
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+
+    return str(value)
@@ -0,0 +1,112 @@
+"""Latency based request timeouts for the nodes of a C.M.I."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import math
+import time
+from typing import Any
+
+from ta_cmi import CMIAPI
+
+from .const import (
+    _LOGGER,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_PERCENTILE,
+    LATENCY_SAMPLES,
+    LATENCY_TIMEOUT_CEILING,
+    LATENCY_TIMEOUT_FACTOR,
+    LATENCY_TIMEOUT_FLOOR,
+)
+
+
+class LatencyTracker:
+    """Keep the latest request durations of a node and derive the timeout."""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES) -> None:
+        """Initialize."""
+        self.durations: deque[float] = deque(maxlen=samples)
+        self.timeouts = 0
+        self.consecutive_timeouts = 0
+
+    def add(self, duration: float) -> None:
+        """Record the duration of a successful request."""
+        self.durations.append(duration)
+        self.consecutive_timeouts = 0
+
+    def add_timeout(self) -> None:
+        """Record a request that ran into the timeout."""
+        self.timeouts += 1
+        self.consecutive_timeouts += 1
+
+    @property
+    def percentile(self) -> float | None:
+        """Return the configured percentile of the durations."""
+        if len(self.durations) < LATENCY_MIN_SAMPLES:
+            return None
+
+        durations = sorted(self.durations)
+        index = math.ceil(LATENCY_PERCENTILE * len(durations)) - 1
+
+        return durations[index]
+
+    def timeout(self) -> float:
+        """Return the timeout of the next request.
+
+        Until enough requests were measured and after a timeout, the ceiling is
+        used so a slow node is not cut off by an outdated estimation.
+        """
+        percentile = self.percentile
+
+        if percentile is None or self.consecutive_timeouts > 0:
+            return LATENCY_TIMEOUT_CEILING
+
+        return min(
+            LATENCY_TIMEOUT_CEILING,
+            max(LATENCY_TIMEOUT_FLOOR, percentile * LATENCY_TIMEOUT_FACTOR),
+        )
+
+    def should_retry(self) -> bool:
+        """Return if a timed out request should be retried in the same update."""
+        return self.consecutive_timeouts == 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Represent the tracker as a dictionary."""
+        return {
+            "samples": len(self.durations),
+            "percentile": self.percentile,
+            "timeout": self.timeout(),
+            "timeouts": self.timeouts,
+            "consecutive_timeouts": self.consecutive_timeouts,
+        }
+
+
+class AdaptiveTimeoutAPI:
+    """Apply the timeout of the node to every device request of an API."""
+
+    def __init__(self, api: CMIAPI, trackers: dict[str, LatencyTracker]) -> None:
+        """Initialize."""
+        self.api = api
+        self.trackers = trackers
+
+    async def get_device_data(self, node_id: str, parameter: str) -> dict[str, Any]:
+        """Get data from device within the timeout of the node."""
+        tracker = self.trackers.setdefault(node_id, LatencyTracker())
+        request_timeout = tracker.timeout()
+        start = time.monotonic()
+
+        try:
+            async with asyncio.timeout(request_timeout):
+                data = await self.api.get_device_data(node_id, parameter)
+        except TimeoutError:
+            _LOGGER.debug(
+                "Request to node %s timed out after %s seconds",
+                node_id,
+                request_timeout,
+            )
+            tracker.add_timeout()
+            raise
+
+        tracker.add(time.monotonic() - start)
+
+        return data
@@ -0,0 +1,71 @@
+"""Status tracking of the nodes connected to a C.M.I."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import random
+import time
+from typing import Any
+
+from .const import (
+    CIRCUIT_BREAKER_PROBE_INTERVAL,
+    CIRCUIT_BREAKER_THRESHOLD,
+    NODE_BACKOFF_BASE,
+    NODE_BACKOFF_JITTER,
+    NODE_BACKOFF_MAX,
+)
+
+
+@dataclass
+class NodeStatus:
+    """Result of the last updates of a node."""
+
+    available: bool = True
+    consecutive_failures: int = 0
+    total_failures: int = 0
+    rate_limit_hits: int = 0
+    last_error: str | None = None
+    last_success: float | None = None
+    last_failure: float | None = None
+    next_attempt: float = 0
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return if the node failed so often that it is only checked rarely."""
+        return self.consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD
+
+    def should_poll(self, now: float | None = None) -> bool:
+        """Return if the node should be requested in this update."""
+        if now is None:
+            now = time.time()
+
+        return now >= self.next_attempt
+
+    def mark_success(self) -> None:
+        """Record a successful update."""
+        self.available = True
+        self.consecutive_failures = 0
+        self.last_success = time.time()
+        self.next_attempt = 0
+
+    def mark_failure(self, err: Exception) -> None:
+        """Record a failed update and schedule the next attempt."""
+        self.available = False
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = str(err)
+        self.last_failure = time.time()
+
+        if self.circuit_open:
+            delay = CIRCUIT_BREAKER_PROBE_INTERVAL
+        else:
+            delay = min(
+                NODE_BACKOFF_MAX,
+                NODE_BACKOFF_BASE * 2 ** (self.consecutive_failures - 1),
+            )
+
+        jitter = random.uniform(-NODE_BACKOFF_JITTER, NODE_BACKOFF_JITTER)
+        self.next_attempt = self.last_failure + delay * (1 + jitter)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Represent the status as a dictionary."""
+        return asdict(self) | {"circuit_open": self.circuit_open}
@@ -0,0 +1,87 @@
+"""Profile the update cycles of the C.M.I. coordinator."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import cProfile
+import io
+from pathlib import Path
+import pstats
+
+from .const import (
+    _LOGGER,
+    PROFILE_PHASE_DISPATCH,
+    PROFILE_PHASE_FETCH,
+    PROFILE_PHASE_PARSE,
+    PROFILE_TOP_FUNCTIONS,
+)
+
+PHASES: tuple[str, ...] = (
+    PROFILE_PHASE_FETCH,
+    PROFILE_PHASE_PARSE,
+    PROFILE_PHASE_DISPATCH,
+)
+
+
+class CycleProfiler:
+    """Collect a separate profile for every phase of the update cycles."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.profiles: dict[str, cProfile.Profile] = {
+            phase: cProfile.Profile() for phase in PHASES
+        }
+        self.calls: dict[str, int] = {phase: 0 for phase in PHASES}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Profile the code of a phase."""
+        profile = self.profiles[name]
+
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Only one profiler can be active at the same time.
+            _LOGGER.debug("Could not profile the %s phase: %s", name, err)
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.calls[name] += 1
+
+    def write(self, directory: Path, prefix: str) -> list[Path]:
+        """Write the stats of every phase and a summary of the top functions."""
+        directory.mkdir(parents=True, exist_ok=True)
+
+        files: list[Path] = []
+        summary = io.StringIO()
+
+        for name, profile in self.profiles.items():
+            summary.write(f"===== {name} ({self.calls[name]} calls) =====\n")
+
+            if not self.calls[name]:
+                summary.write("Not profiled\n\n")
+                continue
+
+            stats_file = directory / f"{prefix}_{name}.prof"
+            profile.dump_stats(stats_file)
+            files.append(stats_file)
+
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                PROFILE_TOP_FUNCTIONS
+            )
+
+        summary.write(
+            f"The {PROFILE_PHASE_FETCH} phase waits for the C.M.I., code of other "
+            "tasks that ran in the meantime is part of its profile.\n"
+        )
+
+        summary_file = directory / f"{prefix}_summary.txt"
+        summary_file.write_text(summary.getvalue())
+        files.append(summary_file)
+
+        return files
@@ -0,0 +1,146 @@
+"""Host level rate limiting for the Technische Alternative C.M.I. integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    _LOGGER,
+    CONF_DEVICE_TYPE,
+    DATA_SCHEDULER,
+    DEVICE_DELAY,
+    DEVICE_TYPE_REQUESTS,
+    MAX_CONCURRENT_REQUESTS,
+)
+
+
+def get_minimum_scan_interval(devices: list[dict[str, Any]]) -> int:
+    """Return the seconds the requests of one update of all nodes take."""
+    requests: int = sum(
+        DEVICE_TYPE_REQUESTS.get(device.get(CONF_DEVICE_TYPE, ""), 1)
+        for device in devices
+    )
+
+    return max(1, requests) * DEVICE_DELAY
+
+
+async def custom_sleep(delay: float) -> None:
+    """Custom sleep function to prevent Home Assistant from canceling."""
+    start = time.time()
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        elapsed = time.time() - start
+        _LOGGER.debug(
+            "Sleep cancelled after %s. Sleep remaining time: %s",
+            elapsed,
+            delay - elapsed,
+        )
+        await asyncio.sleep(delay - elapsed)
+
+
+class HostRateLimiter:
+    """Serialize the requests to one C.M.I. and keep the gap between them."""
+
+    def __init__(self, host: str, delay: float = DEVICE_DELAY) -> None:
+        """Initialize."""
+        self.host = host
+        self.delay = delay
+        self.last_request: float = 0
+        self.queued = 0
+
+        self._lock = asyncio.Lock()
+
+    @callback
+    def register_request(self, timestamp: float | None = None) -> None:
+        """Register a request that was sent to the C.M.I."""
+        if timestamp is None:
+            timestamp = time.time()
+
+        self.last_request = max(self.last_request, timestamp)
+
+    def time_until_next_request(self) -> float:
+        """Return the seconds until the next request is allowed."""
+        return max(0.0, self.last_request + self.delay - time.time())
+
+    def estimate_wait(self) -> float:
+        """Return the seconds until a request queued now is sent."""
+        return self.time_until_next_request() + self.queued * self.delay
+
+    @asynccontextmanager
+    async def async_request(self) -> AsyncIterator[None]:
+        """Wait for a free request slot and register the request afterward."""
+        self.queued += 1
+
+        try:
+            async with self._lock:
+                wait_time = self.time_until_next_request()
+
+                if wait_time > 0:
+                    _LOGGER.debug(
+                        "Sleep mode for %s seconds to prevent rate limiting (%s)",
+                        wait_time,
+                        self.host,
+                    )
+                    await custom_sleep(wait_time)
+
+                try:
+                    yield
+                finally:
+                    self.register_request()
+        finally:
+            self.queued -= 1
+
+
+class CMIScheduler:
+    """Schedule the requests to all C.M.I.s of the integration.
+
+    Every host keeps its own rate limit, so different hosts are requested in
+    parallel. The number of requests in flight over all hosts is limited.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS) -> None:
+        """Initialize."""
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.rate_limiters: dict[str, HostRateLimiter] = {}
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @callback
+    def get_rate_limiter(self, host: str) -> HostRateLimiter:
+        """Get the rate limiter of a host."""
+        if host not in self.rate_limiters:
+            self.rate_limiters[host] = HostRateLimiter(host)
+
+        return self.rate_limiters[host]
+
+    @asynccontextmanager
+    async def async_request(self, rate_limiter: HostRateLimiter) -> AsyncIterator[None]:
+        """Wait for the rate limit of the host and a free global slot."""
+        async with rate_limiter.async_request(), self._semaphore:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> CMIScheduler:
+    """Get the scheduler shared by all config entries."""
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = CMIScheduler()
+
+    return hass.data[DATA_SCHEDULER]
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, host: str) -> HostRateLimiter:
+    """Get the rate limiter shared by everything that talks to a host."""
+    return async_get_scheduler(hass).get_rate_limiter(host)
@@ -1,32 +1,35 @@
 """C.M.I sensor platform."""
 from __future__ import annotations
 
-from typing import Any
-
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    ATTR_IDENTIFIERS,
-    ATTR_MANUFACTURER,
-    ATTR_MODEL,
-    ATTR_NAME,
-    ATTR_SW_VERSION,
-    CONF_API_VERSION,
-    CONF_HOST,
-)
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from ta_cmi import ChannelType
 
 from . import CMIDataUpdateCoordinator
-from .const import DEFAULT_DEVICE_CLASS_MAP, DEVICE_TYPE, DOMAIN, NEW_UID, TYPE_SENSOR, _LOGGER
+from .const import (
+    _LOGGER,
+    CONF_STATISTICS_CHANNEL_TYPES,
+    CONF_STATISTICS_ENTITY_MODE,
+    DEFAULT_DEVICE_CLASS_MAP,
+    DEVICE_TYPE_STRING_MAP,
+    DOMAIN,
+    NEW_UID,
+    STATISTICS_ENTITY_MODE_DISABLED,
+    STATISTICS_ENTITY_MODE_ENABLED,
+    STATISTICS_ENTITY_MODE_NONE,
+    TYPE_DERIVED,
+    TYPE_SENSOR,
+)
+from .device_parser import ChannelData
 
 
 async def async_setup_entry(
@@ -44,6 +47,13 @@ async def async_setup_entry(
     if config_entry.data.get(NEW_UID, False):
         entry_id = config_entry.entry_id
 
+    statistics_channel_types: list[str] = config_entry.data.get(
+        CONF_STATISTICS_CHANNEL_TYPES, []
+    )
+    statistics_entity_mode: str = config_entry.data.get(
+        CONF_STATISTICS_ENTITY_MODE, STATISTICS_ENTITY_MODE_ENABLED
+    )
+
     device_registry = dr.async_get(hass)
 
     for ent in coordinator.data:
@@ -51,27 +61,37 @@ async def async_setup_entry(
             if coordinator.data[ent][TYPE_SENSOR].get(channel_type.name, None) is None:
                 continue
 
+            only_statistics: bool = (
+                DEVICE_TYPE_STRING_MAP.get(channel_type, "") in statistics_channel_types
+            )
+
+            if only_statistics and statistics_entity_mode == STATISTICS_ENTITY_MODE_NONE:
+                continue
+
+            enabled_default: bool = not (
+                only_statistics
+                and statistics_entity_mode == STATISTICS_ENTITY_MODE_DISABLED
+            )
+
             available_channels = coordinator.data[ent][TYPE_SENSOR][channel_type.name]
             for ch_id in available_channels:
                 channel: DeviceChannelSensor = DeviceChannelSensor(
-                    coordinator, ent, ch_id, channel_type.name, entry_id,
-                    (DOMAIN, coordinator.data[ent][CONF_HOST], ent)
+                    coordinator, ent, ch_id, channel_type.name, entry_id, enabled_default
                 )
 
                 entities.append(channel)
 
+        for derived_id in coordinator.data[ent].get(TYPE_DERIVED, {}):
+            entities.append(DerivedSensor(coordinator, ent, derived_id, entry_id))
+
         if dev := device_registry.async_get_device({(DOMAIN, ent)}):
             _LOGGER.info("Updating device identifiers.")
             device_registry.async_update_device(dev.id, new_identifiers={(DOMAIN, coordinator.data[ent][CONF_HOST], ent)})
 
         device_registry.async_get_or_create(
             config_entry_id=config_entry.entry_id,
-            identifiers={(DOMAIN, coordinator.data[ent][CONF_HOST], ent)},
-            manufacturer="Technische Alternative",
-            name=coordinator.data[ent][DEVICE_TYPE],
-            model=coordinator.data[ent][DEVICE_TYPE],
-            sw_version=coordinator.data[ent][CONF_API_VERSION],
             configuration_url=coordinator.data[ent][CONF_HOST],
+            **coordinator.device_infos[ent],
         )
 
     async_add_entities(entities)
@@ -80,6 +100,8 @@ async def async_setup_entry(
 class DeviceChannelSensor(CoordinatorEntity, SensorEntity):
     """Representation of an C.M.I channel."""
 
+    _use_default_device_class: bool = True
+
     def __init__(
         self,
         coordinator: CMIDataUpdateCoordinator,
@@ -87,7 +109,7 @@ class DeviceChannelSensor(CoordinatorEntity, SensorEntity):
         channel_id: str,
         input_type: ChannelType,
         entry_id: str | None,
-        device_id: tuple[str, str, str]
+        enabled_default: bool = True,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator)
@@ -95,16 +117,13 @@ class DeviceChannelSensor(CoordinatorEntity, SensorEntity):
         self._node_id = node_id
         self._input_type = input_type
         self._coordinator = coordinator
-        self._device_id = device_id
+        self._attr_device_info = coordinator.device_infos[node_id]
+        self._attr_entity_registry_enabled_default = enabled_default
 
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
-            TYPE_SENSOR
-        ][self._input_type][self._id]
+        channel_raw: ChannelData = self._get_channel_data()
 
-        name: str = channel_raw["name"]
-        mode: str = channel_raw["mode"]
+        mode: str = channel_raw.mode
 
-        self._attr_name: str = name or f"Node: {self._node_id} - {mode} {self._id}"
         if entry_id:
             self._attr_unique_id: str = (
                 f"ta-cmi-{entry_id}-{self._node_id}-{mode}{self._id}"
@@ -112,62 +131,91 @@ class DeviceChannelSensor(CoordinatorEntity, SensorEntity):
         else:
             self._attr_unique_id: str = f"ta-cmi-{self._node_id}-{mode}{self._id}"
 
+        self._last_attributes: tuple | None = None
+        self._last_version: tuple[int, bool] | None = None
+        self._update_attributes()
+
+    def _get_channel_data(self) -> ChannelData:
+        """Return the current data of the channel."""
+        return self._coordinator.data[self._node_id][TYPE_SENSOR][self._input_type][
+            self._id
+        ]
+
     @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
-            TYPE_SENSOR
-        ][self._input_type][self._id]
+    def available(self) -> bool:
+        """Return if the entity and its node are available."""
+        return super().available and self._coordinator.is_node_available(
+            self._node_id
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        # The attributes only change with the data or the availability of the node.
+        version = (
+            self._coordinator.data.node_version(self._node_id),
+            self.available,
+        )
 
-        value: str = channel_raw["value"]
+        if version == self._last_version:
+            return
 
-        return value
+        self._last_version = version
 
-    @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement of this entity, if any."""
+        if self._update_attributes():
+            self.async_write_ha_state()
 
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
-            TYPE_SENSOR
-        ][self._input_type][self._id]
+    def _update_attributes(self) -> bool:
+        """Update the entity attributes and return if something changed."""
+        channel_raw: ChannelData = self._get_channel_data()
 
-        unit: str = channel_raw["unit"]
+        value: str = channel_raw.value
+        unit: str = channel_raw.unit
+        device_class: SensorDeviceClass | None = channel_raw.device_class
+        name: str = (
+            channel_raw.name or f"Node: {self._node_id} - {channel_raw.mode} {self._id}"
+        )
 
-        return unit
+        if device_class is None and self._use_default_device_class:
+            device_class = DEFAULT_DEVICE_CLASS_MAP.get(unit, None)
 
-    @property
-    def state_class(self) -> str:
-        """Return the state class of the sensor."""
-        if self.device_class == SensorDeviceClass.ENERGY:
-            return SensorStateClass.TOTAL
+        state_class: SensorStateClass = SensorStateClass.MEASUREMENT
 
-        return SensorStateClass.MEASUREMENT
+        if device_class == SensorDeviceClass.ENERGY:
+            state_class = SensorStateClass.TOTAL
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
+        attributes = (value, unit, device_class, state_class, name, self.available)
 
-        device_api_type: str = self._coordinator.data[self._node_id][CONF_API_VERSION]
-        device_name: str = self._coordinator.data[self._node_id][DEVICE_TYPE]
+        if attributes == self._last_attributes:
+            return False
 
-        return {
-            ATTR_NAME: device_name,
-            ATTR_IDENTIFIERS: {self._device_id},
-            ATTR_MANUFACTURER: "Technische Alternative",
-            ATTR_MODEL: device_name,
-            ATTR_SW_VERSION: device_api_type,
-        }
+        self._last_attributes = attributes
+
+        self._attr_native_value = value
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_name = name
+
+        return True
 
-    @property
-    def device_class(self) -> SensorDeviceClass | None:
-        """Return the device class of this entity, if any."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._node_id][
-            TYPE_SENSOR
-        ][self._input_type][self._id]
 
-        device_class: SensorDeviceClass = channel_raw["device_class"]
+class DerivedSensor(DeviceChannelSensor):
+    """Representation of a value derived from C.M.I channels."""
 
-        if device_class is None:
-            return DEFAULT_DEVICE_CLASS_MAP.get(channel_raw["unit"], None)  # type: ignore[unreachable]
+    # The device class of a derived value is already resolved by the engine.
+    _use_default_device_class = False
+
+    def __init__(
+        self,
+        coordinator: CMIDataUpdateCoordinator,
+        node_id: str,
+        derived_id: int,
+        entry_id: str | None,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator, node_id, derived_id, TYPE_DERIVED, entry_id)
 
-        return device_class
+    def _get_channel_data(self) -> ChannelData:
+        """Return the current data of the derived value."""
+        return self._coordinator.data[self._node_id][TYPE_DERIVED][self._id]
@@ -0,0 +1,209 @@
+"""Services of the Technische Alternative C.M.I. integration."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.util import dt as dt_util, slugify
+from ta_cmi import ChannelMode
+import voluptuous as vol
+
+from .const import _LOGGER, DOMAIN, PROFILE_MAX_CYCLES
+
+if TYPE_CHECKING:
+    from . import CMIDataUpdateCoordinator
+
+SERVICE_PROFILE_CYCLE: str = "profile_cycle"
+SERVICE_REFRESH_NODE: str = "refresh_node"
+SERVICE_SEND_COE_VALUE: str = "send_coe_value"
+
+EVENT_PROFILE_FINISHED: str = f"{DOMAIN}_profile_finished"
+
+ATTR_CHANNEL: str = "channel"
+ATTR_CONFIG_ENTRY_ID: str = "config_entry_id"
+ATTR_CYCLES: str = "cycles"
+ATTR_FILES: str = "files"
+ATTR_DIGITAL: str = "digital"
+ATTR_UNIT: str = "unit"
+ATTR_VALUE: str = "value"
+
+REFRESH_NODE_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+PROFILE_CYCLE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_CYCLES)
+        ),
+    }
+)
+
+SEND_COE_VALUE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_CHANNEL): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+        vol.Required(ATTR_VALUE): vol.Coerce(float),
+        vol.Optional(ATTR_UNIT, default=0): vol.Coerce(int),
+        vol.Optional(ATTR_DIGITAL, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_refresh_node(call: ServiceCall) -> ServiceResponse:
+        """Queue the update of a single node."""
+        coordinator, node_id = _async_get_node(hass, call.data[ATTR_DEVICE_ID])
+
+        position, expected_completion = coordinator.async_request_node_refresh(
+            node_id
+        )
+
+        return {
+            "queue_position": position,
+            "expected_completion": expected_completion.isoformat(),
+        }
+
+    async def async_send_coe_value(call: ServiceCall) -> None:
+        """Queue a value for the CAN network."""
+        coordinator = _async_get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+        if coordinator.coe_transmitter is None:
+            raise ServiceValidationError(
+                f"{call.data[ATTR_CONFIG_ENTRY_ID]} has no CoE server configured"
+            )
+
+        coordinator.coe_transmitter.async_queue(
+            ChannelMode.DIGITAL if call.data[ATTR_DIGITAL] else ChannelMode.ANALOG,
+            call.data[ATTR_CHANNEL],
+            call.data[ATTR_VALUE],
+            str(call.data[ATTR_UNIT]),
+        )
+
+    async def async_profile_cycle(call: ServiceCall) -> None:
+        """Profile the next update cycles of a C.M.I."""
+        coordinator = _async_get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+        if coordinator.profiler is not None:
+            raise ServiceValidationError(
+                f"{call.data[ATTR_CONFIG_ENTRY_ID]} is already profiled"
+            )
+
+        # Only loaded if a profile is requested.
+        from .profiler import CycleProfiler
+
+        coordinator.profiler = CycleProfiler()
+
+        hass.async_create_background_task(
+            _async_profile_cycles(
+                hass,
+                call.data[ATTR_CONFIG_ENTRY_ID],
+                coordinator,
+                call.data[ATTR_CYCLES],
+            ),
+            f"{DOMAIN} profile cycle",
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_CYCLE,
+        async_profile_cycle,
+        schema=PROFILE_CYCLE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_NODE,
+        async_refresh_node,
+        schema=REFRESH_NODE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_COE_VALUE,
+        async_send_coe_value,
+        schema=SEND_COE_VALUE_SCHEMA,
+    )
+
+
+async def _async_profile_cycles(
+    hass: HomeAssistant,
+    entry_id: str,
+    coordinator: CMIDataUpdateCoordinator,
+    cycles: int,
+) -> None:
+    """Run update cycles under the profiler and write the results."""
+    try:
+        for _ in range(cycles):
+            await coordinator.async_refresh()
+    finally:
+        profiler, coordinator.profiler = coordinator.profiler, None
+
+    timestamp: str = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    prefix: str = f"{timestamp}_{slugify(coordinator.host)}"
+
+    files = await hass.async_add_executor_job(
+        profiler.write, Path(hass.config.path(DOMAIN, "profiles")), prefix
+    )
+
+    _LOGGER.info("Profile of %s cycles written to %s", cycles, files[-1])
+
+    hass.bus.async_fire(
+        EVENT_PROFILE_FINISHED,
+        {
+            ATTR_CONFIG_ENTRY_ID: entry_id,
+            ATTR_FILES: [str(file) for file in files],
+        },
+    )
+
+
+@callback
+def _async_get_coordinator(
+    hass: HomeAssistant, entry_id: str
+) -> CMIDataUpdateCoordinator:
+    """Return the coordinator of a config entry."""
+    coordinator: CMIDataUpdateCoordinator | None = hass.data.get(DOMAIN, {}).get(
+        entry_id
+    )
+
+    if coordinator is None:
+        raise ServiceValidationError(f"{entry_id} is not a loaded C.M.I.")
+
+    return coordinator
+
+
+@callback
+def _async_get_node(
+    hass: HomeAssistant, device_id: str
+) -> tuple[CMIDataUpdateCoordinator, str]:
+    """Return the coordinator and the node id of a device."""
+    device = dr.async_get(hass).async_get(device_id)
+
+    if device is not None:
+        for entry_id in device.config_entries:
+            coordinator: CMIDataUpdateCoordinator | None = hass.data.get(
+                DOMAIN, {}
+            ).get(entry_id)
+
+            if coordinator is None:
+                continue
+
+            for identifier in device.identifiers:
+                if (
+                    identifier[:2] == (DOMAIN, coordinator.host)
+                    and identifier[-1] in coordinator.node_status
+                ):
+                    return coordinator, identifier[-1]
+
+    raise ServiceValidationError(f"{device_id} is not a loaded C.M.I. node")
@@ -0,0 +1,195 @@
+"""Immutable versioned snapshots of the data of the C.M.I. nodes."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from .const import TYPE_BINARY, TYPE_DERIVED, TYPE_SENSOR
+
+if TYPE_CHECKING:
+    from .device_parser import ChannelData
+
+# The derived values of a node are not grouped by a channel type.
+DERIVED_GROUP: str = "DERIVED"
+
+# Keys of the compact representation of a snapshot.
+ATTR_AVAILABLE: str = "available"
+ATTR_CHANNELS: str = "channels"
+ATTR_NODES: str = "nodes"
+ATTR_VERSION: str = "version"
+
+
+def _freeze(value: Any, previous: Any = None) -> Any:
+    """Return a read-only copy of a value that reuses equal parts of the previous one."""
+    if not isinstance(value, Mapping):
+        return value
+
+    if previous is not None and (value is previous or value == previous):
+        return previous
+
+    frozen: dict[Any, Any] = {}
+
+    for key, item in value.items():
+        frozen[key] = _freeze(
+            item, previous.get(key) if isinstance(previous, Mapping) else None
+        )
+
+    return MappingProxyType(frozen)
+
+
+class Snapshot(Mapping[str, Mapping[str, Any]]):
+    """Read-only data of all nodes after an update.
+
+    Every update creates a new version. Nodes whose data did not change are
+    shared with the previous version and keep their node version, so readers
+    can hold a snapshot without copying it and detect changes of a node by
+    comparing its version.
+    """
+
+    __slots__ = ("version", "modified", "_nodes", "_node_versions")
+
+    def __init__(
+        self,
+        nodes: Mapping[str, Mapping[str, Any]] | None = None,
+        node_versions: Mapping[str, tuple[int, float]] | None = None,
+        version: int = 0,
+        modified: float = 0.0,
+    ) -> None:
+        """Initialize."""
+        self.version = version
+        self.modified = modified
+        self._nodes: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+            dict(nodes or {})
+        )
+        self._node_versions: Mapping[str, tuple[int, float]] = MappingProxyType(
+            dict(node_versions or {})
+        )
+
+    def __getitem__(self, node_id: str) -> Mapping[str, Any]:
+        """Return the data of a node."""
+        return self._nodes[node_id]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the node ids."""
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._nodes)
+
+    def __repr__(self) -> str:
+        """Return the representation of the snapshot."""
+        return f"Snapshot(version={self.version}, nodes={dict(self._nodes)!r})"
+
+    def node_version(self, node_id: str) -> int:
+        """Return the version in which the data of a node changed last."""
+        return self._node_versions.get(node_id, (0, 0.0))[0]
+
+    def node_modified(self, node_id: str) -> float:
+        """Return the timestamp when the data of a node changed last."""
+        return self._node_versions.get(node_id, (0, 0.0))[1]
+
+    def evolve(
+        self, nodes: Mapping[str, Mapping[str, Any]], timestamp: float | None = None
+    ) -> Snapshot:
+        """Return the snapshot with the given data of all nodes.
+
+        The snapshot itself is returned if no node changed.
+        """
+        version: int = self.version + 1
+        modified: float = time.time() if timestamp is None else timestamp
+        frozen_nodes: dict[str, Mapping[str, Any]] = {}
+        node_versions: dict[str, tuple[int, float]] = {}
+        changed: bool = nodes.keys() != self._nodes.keys()
+
+        for node_id, node_data in nodes.items():
+            previous: Mapping[str, Any] | None = self._nodes.get(node_id)
+            frozen: Mapping[str, Any] = _freeze(node_data, previous)
+
+            frozen_nodes[node_id] = frozen
+
+            if frozen is previous:
+                node_versions[node_id] = self._node_versions[node_id]
+            else:
+                node_versions[node_id] = (version, modified)
+                changed = True
+
+        if not changed:
+            return self
+
+        return Snapshot(frozen_nodes, node_versions, version, modified)
+
+
+def channel_groups(
+    node_data: Mapping[str, Any]
+) -> dict[tuple[str, str], Mapping[int, ChannelData]]:
+    """Return the channels of a node grouped by entity type and channel type."""
+    groups: dict[tuple[str, str], Mapping[int, ChannelData]] = {}
+
+    for entity_type in (TYPE_SENSOR, TYPE_BINARY):
+        for type_name, channels in node_data.get(entity_type, {}).items():
+            groups[(entity_type, type_name)] = channels
+
+    if TYPE_DERIVED in node_data:
+        groups[(TYPE_DERIVED, DERIVED_GROUP)] = node_data[TYPE_DERIVED]
+
+    return groups
+
+
+def _compact_channel(channel: ChannelData) -> list[Any]:
+    """Return the value, the unit and the name of a channel."""
+    return [channel.value, channel.unit, channel.name]
+
+
+def compact_channels(node_data: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return all channels of a node as compact lists of value, unit and name."""
+    result: dict[str, dict[str, Any]] = {}
+
+    for (entity_type, type_name), channels in channel_groups(node_data).items():
+        result.setdefault(entity_type, {})[type_name] = {
+            str(channel_id): _compact_channel(channel)
+            for channel_id, channel in channels.items()
+        }
+
+    return result
+
+
+def channel_delta(
+    old_node_data: Mapping[str, Any], new_node_data: Mapping[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """Return the channels that changed between two versions of a node.
+
+    Removed channels are None. Groups that are shared by both versions are
+    skipped without comparing their channels.
+    """
+    old_groups = channel_groups(old_node_data)
+    new_groups = channel_groups(new_node_data)
+    result: dict[str, dict[str, Any]] = {}
+
+    for group in old_groups.keys() | new_groups.keys():
+        old_channels: Mapping[int, ChannelData] = old_groups.get(group, {})
+        new_channels: Mapping[int, ChannelData] = new_groups.get(group, {})
+
+        if old_channels is new_channels:
+            continue
+
+        changed: dict[str, Any] = {
+            str(channel_id): _compact_channel(channel)
+            for channel_id, channel in new_channels.items()
+            if old_channels.get(channel_id) != channel
+        }
+        changed.update(
+            {
+                str(channel_id): None
+                for channel_id in old_channels
+                if channel_id not in new_channels
+            }
+        )
+
+        if changed:
+            entity_type, type_name = group
+            result.setdefault(entity_type, {})[type_name] = changed
+
+    return result
@@ -0,0 +1,171 @@
+"""Long-term statistics for the channels of the C.M.I."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+from ta_cmi import ChannelType
+
+from .const import _LOGGER, DEVICE_TYPE, DEVICE_TYPE_STRING_MAP, DOMAIN, TYPE_SENSOR
+
+if TYPE_CHECKING:
+    from . import CMIDataUpdateCoordinator
+    from .device_parser import ChannelData
+
+
+@dataclass(slots=True)
+class _HourAggregate:
+    """Running aggregate of the values of a channel in one hour."""
+
+    total: float = 0
+    count: int = 0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a value to the aggregate."""
+        self.total += value
+        self.count += 1
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+class ChannelStatisticsCollector:
+    """Aggregate channel values per hour and import them as statistics.
+
+    Only the values of the update cycles are aggregated. A refreshed node or
+    changed options notify the listeners again with the values of the cycle.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: CMIDataUpdateCoordinator,
+        channel_types: list[str],
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._channel_types: list[ChannelType] = [
+            channel_type
+            for channel_type, type_string in DEVICE_TYPE_STRING_MAP.items()
+            if type_string in channel_types
+        ]
+
+        self._hour_start: datetime | None = None
+        self._last_cycle: int | None = None
+        self._aggregates: dict[str, _HourAggregate] = {}
+        self._metadata: dict[str, StatisticMetaData] = {}
+
+    @staticmethod
+    def statistic_id(host: str, node_id: str, channel_type: str, channel_id: Any) -> str:
+        """Return the id of the statistic of a channel."""
+        return f"{DOMAIN}:{slugify(f'{host}_{node_id}_{channel_type}_{channel_id}')}"
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Add the values of the latest coordinator update."""
+        if not self.coordinator.last_update_success or self.coordinator.data is None:
+            return
+
+        if self.coordinator.cycles == self._last_cycle:
+            return
+
+        self._last_cycle = self.coordinator.cycles
+        self.async_add_snapshot(self.coordinator.data, dt_util.utcnow())
+
+    @callback
+    def async_add_snapshot(self, data: dict[str, Any], now: datetime) -> None:
+        """Add the values of a snapshot to the aggregate of the current hour."""
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+
+        if self._hour_start is not None and hour_start > self._hour_start:
+            self._async_import_hour()
+
+        self._hour_start = hour_start
+
+        for node_id, node_data in data.items():
+            if not self.coordinator.is_node_available(node_id):
+                continue
+
+            for channel_type in self._channel_types:
+                channels: dict[Any, Any] = node_data[TYPE_SENSOR].get(
+                    channel_type.name, {}
+                )
+
+                for channel_id, channel_raw in channels.items():
+                    value = channel_raw.value
+
+                    if isinstance(value, bool) or not isinstance(value, int | float):
+                        continue
+
+                    statistic_id = self.statistic_id(
+                        self.coordinator.host, node_id, channel_type.name, channel_id
+                    )
+
+                    if statistic_id not in self._metadata:
+                        self._metadata[statistic_id] = self._build_metadata(
+                            statistic_id, node_data, channel_id, channel_raw
+                        )
+
+                    self._aggregates.setdefault(statistic_id, _HourAggregate()).add(
+                        float(value)
+                    )
+
+    @staticmethod
+    def _build_metadata(
+        statistic_id: str,
+        node_data: dict[str, Any],
+        channel_id: Any,
+        channel_raw: ChannelData,
+    ) -> StatisticMetaData:
+        """Build the metadata of a channel statistic."""
+        name: str = (
+            channel_raw.name
+            or f"{node_data[DEVICE_TYPE]} {channel_raw.mode} {channel_id}"
+        )
+
+        return StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=name,
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_class=None,
+            unit_of_measurement=channel_raw.unit or None,
+        )
+
+    @callback
+    def _async_import_hour(self) -> None:
+        """Import the finished hour into the long-term statistics."""
+        for statistic_id, aggregate in self._aggregates.items():
+            async_add_external_statistics(
+                self.hass,
+                self._metadata[statistic_id],
+                [
+                    StatisticData(
+                        start=self._hour_start,
+                        mean=aggregate.total / aggregate.count,
+                        min=aggregate.minimum,
+                        max=aggregate.maximum,
+                    )
+                ],
+            )
+
+        _LOGGER.debug(
+            "Imported statistics of %s channels for %s",
+            len(self._aggregates),
+            self._hour_start,
+        )
+
+        self._aggregates = {}
@@ -0,0 +1,281 @@
+"""HTTP views of the Technische Alternative C.M.I. integration."""
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.const import CONF_API_VERSION, CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+
+from . import CMIDataUpdateCoordinator, async_get_host_coordinator
+from .const import DEVICE_TYPE, DOMAIN
+from .snapshot import (
+    ATTR_AVAILABLE,
+    ATTR_CHANNELS,
+    ATTR_NODES,
+    ATTR_VERSION,
+    Snapshot,
+    channel_groups,
+    compact_channels,
+)
+
+ATTR_NODE: str = "node"
+
+METRICS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@callback
+def async_setup_views(hass: HomeAssistant) -> None:
+    """Register the HTTP views of the integration."""
+    hass.http.register_view(SnapshotView())
+    hass.http.register_view(MetricsView())
+
+
+class SnapshotView(HomeAssistantView):
+    """Serve the latest data of a C.M.I. so other clients do not request it again."""
+
+    url = f"/api/{DOMAIN}/snapshot"
+    name = f"api:{DOMAIN}:snapshot"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the channels of a C.M.I. or of one of its nodes."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        host: str | None = request.query.get(CONF_HOST)
+        node_id: str | None = request.query.get(ATTR_NODE)
+
+        if host is None:
+            return self.json_message("Missing host", HTTPStatus.BAD_REQUEST)
+
+        coordinator = async_get_host_coordinator(hass, host)
+
+        if coordinator is None or coordinator.data is None:
+            return self.json_message(
+                f"{host} is not a loaded C.M.I.", HTTPStatus.NOT_FOUND
+            )
+
+        snapshot: Snapshot = coordinator.data
+        node_ids: list[str] = list(snapshot)
+        version: int = snapshot.version
+        modified: float = snapshot.modified
+
+        if node_id is not None:
+            if node_id not in snapshot:
+                return self.json_message(
+                    f"{node_id} is not a node of {host}", HTTPStatus.NOT_FOUND
+                )
+
+            node_ids = [node_id]
+            version = snapshot.node_version(node_id)
+            modified = snapshot.node_modified(node_id)
+
+        availability: dict[str, bool] = {
+            node: coordinator.is_node_available(node) for node in node_ids
+        }
+
+        # The versions restart after a reload, the time of the change does not.
+        etag: str = "{}-{}-{}".format(
+            version,
+            int(modified * 1000),
+            "".join("1" if available else "0" for available in availability.values()),
+        )
+
+        if _is_not_modified(request, etag, modified):
+            response = web.Response(status=HTTPStatus.NOT_MODIFIED)
+        else:
+            response = self.json(
+                {
+                    CONF_HOST: host,
+                    ATTR_VERSION: version,
+                    ATTR_NODES: {
+                        node: _node_as_dict(snapshot, node, available)
+                        for node, available in availability.items()
+                    },
+                }
+            )
+
+        response.etag = etag
+        response.last_modified = modified
+        response.headers["Cache-Control"] = "no-cache"
+
+        return response
+
+
+def _is_not_modified(request: web.Request, etag: str, modified: float) -> bool:
+    """Return if the client already has the current data."""
+    if request.if_none_match:
+        return any(tag.value in (etag, "*") for tag in request.if_none_match)
+
+    if (if_modified_since := request.if_modified_since) is not None:
+        return int(modified) <= if_modified_since.timestamp()
+
+    return False
+
+
+def _node_as_dict(snapshot: Snapshot, node_id: str, available: bool) -> dict[str, Any]:
+    """Represent the data of a node."""
+    node_data = snapshot[node_id]
+
+    return {
+        ATTR_AVAILABLE: available,
+        ATTR_VERSION: snapshot.node_version(node_id),
+        DEVICE_TYPE: node_data.get(DEVICE_TYPE),
+        CONF_API_VERSION: node_data.get(CONF_API_VERSION),
+        ATTR_CHANNELS: compact_channels(node_data),
+    }
+
+
+class MetricsView(HomeAssistantView):
+    """Serve the channels and the update health of all C.M.I.s for Prometheus."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._cache_key: tuple[tuple[Any, ...], ...] | None = None
+        self._cache: bytes = b""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics in the Prometheus text format."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        coordinators: list[CMIDataUpdateCoordinator] = [
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if coordinator.data is not None
+        ]
+
+        # The metrics only change with an update cycle or a refreshed node.
+        cache_key = tuple(
+            (
+                coordinator.host,
+                coordinator.cycles,
+                coordinator.last_update_success,
+                coordinator.data.version,
+                coordinator.data.modified,
+                tuple(
+                    (
+                        node_id,
+                        status.available,
+                        status.total_failures,
+                        status.rate_limit_hits,
+                    )
+                    for node_id, status in coordinator.node_status.items()
+                ),
+            )
+            for coordinator in coordinators
+        )
+
+        if cache_key != self._cache_key:
+            self._cache = render_metrics(coordinators).encode()
+            self._cache_key = cache_key
+
+        return web.Response(
+            body=self._cache, headers={"Content-Type": METRICS_CONTENT_TYPE}
+        )
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    """Format the labels of a sample."""
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _metric_value(value: Any) -> float | None:
+    """Return the value of a channel as a number or None if it is not numeric."""
+    if value in ("on", "yes"):
+        return 1
+    if value in ("off", "no"):
+        return 0
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+
+    return value
+
+
+def render_metrics(coordinators: list[CMIDataUpdateCoordinator]) -> str:
+    """Render the channels and the update health in the Prometheus text format."""
+    families: dict[str, tuple[str, str, list[str]]] = {
+        "ta_cmi_channel_value": ("gauge", "Current value of a channel.", []),
+        "ta_cmi_up": ("gauge", "Whether the last update of the C.M.I. succeeded.", []),
+        "ta_cmi_cycles_total": ("counter", "Completed update cycles.", []),
+        "ta_cmi_cycle_duration_seconds": (
+            "gauge",
+            "Duration of the last update cycle.",
+            [],
+        ),
+        "ta_cmi_node_available": (
+            "gauge",
+            "Whether the last update of the node succeeded.",
+            [],
+        ),
+        "ta_cmi_node_failures_total": ("counter", "Failed updates of the node.", []),
+        "ta_cmi_node_rate_limit_hits_total": (
+            "counter",
+            "Updates of the node that were rejected by the rate limit.",
+            [],
+        ),
+    }
+
+    def add(metric: str, labels: str, value: float) -> None:
+        """Add a sample to a metric family."""
+        families[metric][2].append(f"{metric}{{{labels}}} {value}")
+
+    for coordinator in coordinators:
+        host: str = coordinator.host
+        snapshot: Snapshot = coordinator.data
+
+        add("ta_cmi_up", _labels(host=host), int(coordinator.last_update_success))
+        add("ta_cmi_cycles_total", _labels(host=host), coordinator.cycles)
+
+        if coordinator.last_cycle_duration is not None:
+            add(
+                "ta_cmi_cycle_duration_seconds",
+                _labels(host=host),
+                round(coordinator.last_cycle_duration, 6),
+            )
+
+        for node_id, status in coordinator.node_status.items():
+            labels: str = _labels(host=host, node=node_id)
+
+            add("ta_cmi_node_available", labels, int(status.available))
+            add("ta_cmi_node_failures_total", labels, status.total_failures)
+            add("ta_cmi_node_rate_limit_hits_total", labels, status.rate_limit_hits)
+
+        for node_id, node_data in snapshot.items():
+            groups = channel_groups(node_data)
+
+            for (entity_type, type_name), channels in groups.items():
+                for channel_id, channel in channels.items():
+                    value = _metric_value(channel.value)
+
+                    if value is None:
+                        continue
+
+                    add(
+                        "ta_cmi_channel_value",
+                        _labels(
+                            host=host,
+                            node=node_id,
+                            entity_type=entity_type,
+                            channel_type=type_name,
+                            channel=channel_id,
+                            name=channel.name or "",
+                            unit=channel.unit or "",
+                        ),
+                        value,
+                    )
+
+    lines: list[str] = []
+
+    for metric, (metric_type, description, samples) in families.items():
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
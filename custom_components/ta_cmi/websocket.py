@@ -0,0 +1,146 @@
+"""Websocket API of the Technische Alternative C.M.I. integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+
+from . import async_get_host_coordinator
+from .const import DOMAIN
+from .snapshot import (
+    ATTR_AVAILABLE,
+    ATTR_CHANNELS,
+    ATTR_NODES,
+    ATTR_VERSION,
+    Snapshot,
+    channel_delta,
+    compact_channels,
+)
+
+ATTR_FULL: str = "full"
+ATTR_NODE: str = "node"
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(CONF_HOST): str,
+        vol.Optional(ATTR_NODE): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the channels of a C.M.I. and then only the changes of every update."""
+    coordinator = async_get_host_coordinator(hass, msg[CONF_HOST])
+
+    if coordinator is None or coordinator.data is None:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"{msg[CONF_HOST]} is not a loaded C.M.I.",
+        )
+        return
+
+    node_ids: list[str] = list(coordinator.data)
+
+    if ATTR_NODE in msg:
+        if msg[ATTR_NODE] not in coordinator.data:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                f"{msg[ATTR_NODE]} is not a node of {msg[CONF_HOST]}",
+            )
+            return
+
+        node_ids = [msg[ATTR_NODE]]
+
+    snapshot: Snapshot = coordinator.data
+    availability: dict[str, bool] = {
+        node_id: coordinator.is_node_available(node_id) for node_id in node_ids
+    }
+
+    @callback
+    def async_forward_update() -> None:
+        """Send the channels and the availability of the changed nodes."""
+        nonlocal snapshot
+
+        new_snapshot: Snapshot = coordinator.data
+        nodes: dict[str, dict[str, Any]] = {}
+
+        for node_id in node_ids:
+            node: dict[str, Any] = {}
+
+            available: bool = coordinator.is_node_available(node_id)
+
+            if available != availability[node_id]:
+                availability[node_id] = available
+                node[ATTR_AVAILABLE] = available
+
+            if new_snapshot.node_version(node_id) != snapshot.node_version(node_id):
+                if delta := channel_delta(
+                    snapshot.get(node_id, {}), new_snapshot.get(node_id, {})
+                ):
+                    node[ATTR_CHANNELS] = delta
+
+            if node:
+                nodes[node_id] = node
+
+        snapshot = new_snapshot
+
+        if nodes:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {ATTR_VERSION: snapshot.version, ATTR_NODES: nodes}
+                )
+            )
+
+    unsub_update = coordinator.async_add_listener(async_forward_update)
+
+    @callback
+    def async_unloaded() -> None:
+        """End the subscription, a reloaded entry has a new coordinator."""
+        unsub_update()
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"{msg[CONF_HOST]} was unloaded"
+        )
+
+    unsub_unload = coordinator.async_add_unload_listener(async_unloaded)
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop forwarding the updates."""
+        unsub_update()
+        unsub_unload()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                ATTR_VERSION: snapshot.version,
+                ATTR_FULL: True,
+                ATTR_NODES: {
+                    node_id: {
+                        ATTR_AVAILABLE: availability[node_id],
+                        ATTR_CHANNELS: compact_channels(snapshot[node_id]),
+                    }
+                    for node_id in node_ids
+                },
+            },
+        )
+    )
@@ -0,0 +1,92 @@
+"""Test the transmission of values to the CAN network."""
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from aiohttp import ClientError
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from ta_cmi import ApiError, ChannelMode
+
+from custom_components.ta_cmi.coe_transmit import CoETransmitter
+from custom_components.ta_cmi.const import COE_RETRY_BASE
+
+
+async def _async_send_due(hass: HomeAssistant, seconds: float = 1) -> None:
+    """Let the scheduled frames run."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+def _sent_values(send_mock: AsyncMock) -> list[list[tuple[int, float, str]]]:
+    """Return the values of every request."""
+    return [
+        [(channel.index, channel.value, channel.unit) for channel in call.args[0]]
+        for call in send_mock.call_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_values_coalesced(hass: HomeAssistant) -> None:
+    """Test that pending values are sent in one request and resends are dropped."""
+    coe = AsyncMock()
+    transmitter = CoETransmitter(hass, coe, send_interval=10)
+
+    transmitter.async_queue(ChannelMode.ANALOG, 1, 20.5, "1")
+    transmitter.async_queue(ChannelMode.ANALOG, 2, 3.0, "0")
+    transmitter.async_queue(ChannelMode.ANALOG, 1, 21.0, "1")
+    transmitter.async_queue(ChannelMode.DIGITAL, 3, 1, "0")
+    await _async_send_due(hass)
+
+    assert _sent_values(coe.send_analog_values_v2) == [[(1, 21.0, "1"), (2, 3.0, "0")]]
+    assert _sent_values(coe.send_digital_values_v2) == [[(3, True, "0")]]
+
+    transmitter.async_queue(ChannelMode.ANALOG, 1, 21.0, "1")
+    transmitter.async_queue(ChannelMode.ANALOG, 2, 4.0, "0")
+    await _async_send_due(hass)
+
+    transmitter.async_queue(ChannelMode.DIGITAL, 4, 1, "0")
+    await _async_send_due(hass)
+
+    # The send interval of the CoE server did not pass yet.
+    assert coe.send_analog_values_v2.call_count == 1
+    assert coe.send_digital_values_v2.call_count == 1
+
+    await _async_send_due(hass, 11)
+
+    assert _sent_values(coe.send_analog_values_v2)[-1] == [(2, 4.0, "0")]
+    assert _sent_values(coe.send_digital_values_v2)[-1] == [(4, True, "0")]
+    assert transmitter.as_dict() == {
+        "frames_sent": 4,
+        "values_sent": 5,
+        "values_skipped": 1,
+        "pending": {"ANALOG": 0, "DIGITAL": 0},
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [ApiError("Could not connect"), ClientError(), TimeoutError()]
+)
+async def test_failed_values_kept(hass: HomeAssistant, error: Exception) -> None:
+    """Test that values of a failed request are retried after a delay."""
+    coe = AsyncMock()
+    coe.send_analog_values_v2.side_effect = [error, None]
+    transmitter = CoETransmitter(hass, coe, send_interval=0)
+
+    transmitter.async_queue(ChannelMode.ANALOG, 1, 20.5, "1")
+    await _async_send_due(hass)
+
+    assert transmitter.frames_sent == 0
+
+    # The retry waits for the backoff after the failed request.
+    await _async_send_due(hass, COE_RETRY_BASE / 2)
+
+    assert coe.send_analog_values_v2.call_count == 1
+
+    await _async_send_due(hass, COE_RETRY_BASE + 1)
+
+    assert _sent_values(coe.send_analog_values_v2)[-1] == [(1, 20.5, "1")]
+    assert transmitter.frames_sent == 1
+    assert transmitter.as_dict()["pending"] == {"ANALOG": 0, "DIGITAL": 0}
@@ -10,25 +10,43 @@ import pytest
 from homeassistant.config_entries import SOURCE_USER
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.data_entry_flow import FlowResultType, InvalidData
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from ta_cmi import CMIAPI, ApiError, Device, InvalidCredentialsError, RateLimitError
 
 from custom_components.ta_cmi.config_flow import ConfigFlow
 from custom_components.ta_cmi.const import (
+    CONF_CAPTURE,
     CONF_CHANNELS,
     CONF_CHANNELS_DEVICE_CLASS,
     CONF_CHANNELS_ID,
     CONF_CHANNELS_NAME,
     CONF_CHANNELS_TYPE,
+    CONF_COE_HOST,
+    CONF_DEADBAND,
+    CONF_DERIVED,
+    CONF_DERIVED_CHANNEL_ID,
+    CONF_DERIVED_CHANNEL_TYPE,
+    CONF_DERIVED_FUNCTION,
+    CONF_DERIVED_ID,
+    CONF_DERIVED_NAME,
+    CONF_DERIVED_NODE,
+    CONF_DERIVED_SECOND_CHANNEL_ID,
+    CONF_DERIVED_SECOND_CHANNEL_TYPE,
+    CONF_DERIVED_WINDOW,
     CONF_DEVICE_FETCH_MODE,
     CONF_DEVICE_ID,
     CONF_DEVICE_TYPE,
     CONF_DEVICES,
     CONF_SCAN_INTERVAL,
+    CONF_STATISTICS_CHANNEL_TYPES,
+    CONF_STATISTICS_ENTITY_MODE,
+    DEVICE_DELAY,
     DOMAIN,
     NEW_UID,
+    STATISTICS_ENTITY_MODE_ENABLED,
 )
+from custom_components.ta_cmi.rate_limit import async_get_rate_limiter
 
 from . import sleep_mock
 
@@ -130,11 +148,11 @@ DUMMY_CONFIG_ENTRY: dict[str, Any] = {
 }
 
 DUMMY_ENTRY_CHANGE: dict[str, Any] = {
-    CONF_SCAN_INTERVAL: 15,
+    CONF_SCAN_INTERVAL: 900,
 }
 
 DUMMY_ENTRY_CHANGE_IP: dict[str, Any] = {
-    CONF_SCAN_INTERVAL: 15,
+    CONF_SCAN_INTERVAL: 900,
     CONF_HOST: "http://localhost2",
 }
 
@@ -143,7 +161,13 @@ DUMMY_CONFIG_ENTRY_UPDATED: dict[str, Any] = {
     CONF_USERNAME: "test",
     CONF_PASSWORD: "test",
     NEW_UID: True,
-    CONF_SCAN_INTERVAL: 15,
+    CONF_SCAN_INTERVAL: 900,
+    CONF_STATISTICS_CHANNEL_TYPES: [],
+    CONF_STATISTICS_ENTITY_MODE: STATISTICS_ENTITY_MODE_ENABLED,
+    CONF_CAPTURE: False,
+    CONF_COE_HOST: "",
+    CONF_DEADBAND: False,
+    CONF_DERIVED: [],
     CONF_DEVICES: [
         {
             CONF_DEVICE_ID: "2",
@@ -159,7 +183,13 @@ DUMMY_CONFIG_ENTRY_UPDATED_IP: dict[str, Any] = {
     CONF_USERNAME: "test",
     CONF_PASSWORD: "test",
     NEW_UID: True,
-    CONF_SCAN_INTERVAL: 15,
+    CONF_SCAN_INTERVAL: 900,
+    CONF_STATISTICS_CHANNEL_TYPES: [],
+    CONF_STATISTICS_ENTITY_MODE: STATISTICS_ENTITY_MODE_ENABLED,
+    CONF_CAPTURE: False,
+    CONF_COE_HOST: "",
+    CONF_DEADBAND: False,
+    CONF_DERIVED: [],
     CONF_DEVICES: [
         {
             CONF_DEVICE_ID: "2",
@@ -421,11 +451,12 @@ async def test_step_devices_with_edit(hass: HomeAssistant) -> None:
 
 
 @pytest.mark.asyncio
-async def test_step_finish_dynamic_wait(hass: HomeAssistant) -> None:
-    """Test the finish step with dynamic waiting."""
+async def test_step_finish_registers_last_request(hass: HomeAssistant) -> None:
+    """Test the finish step hands the last request to the rate limiter."""
+    start_time = time.time()
 
     with patch("asyncio.sleep", wraps=sleep_mock) as mock, patch.object(
-        ConfigFlow, "init_start_time", time.time()
+        ConfigFlow, "init_start_time", start_time
     ):
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -436,7 +467,11 @@ async def test_step_finish_dynamic_wait(hass: HomeAssistant) -> None:
         assert result["type"] == FlowResultType.CREATE_ENTRY
         assert result["title"] == "1.2.3.4"
 
-        mock.assert_called_once()
+        mock.assert_not_called()
+
+        limiter = async_get_rate_limiter(hass, "http://1.2.3.4")
+        assert limiter.last_request == start_time
+        assert limiter.time_until_next_request() > 0
 
 
 @pytest.mark.asyncio
@@ -707,3 +742,93 @@ async def test_options_flow_ip_change_unexpected_error(hass: HomeAssistant) -> N
         assert result["step_id"] == "init"
         assert result["errors"] == {"base": "unknown"}
         assert dict(config_entry.options) == {}
+
+
+@pytest.mark.asyncio
+async def test_options_flow_scan_interval_below_budget(hass: HomeAssistant) -> None:
+    """Test that the scan interval has to fit the requests of all nodes."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="C.M.I",
+        data=DUMMY_CONFIG_ENTRY,
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.ta_cmi.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+        # A UVR16x2 is fetched with two requests.
+        with pytest.raises(InvalidData):
+            await hass.config_entries.options.async_configure(
+                result["flow_id"],
+                user_input={CONF_SCAN_INTERVAL: 2 * DEVICE_DELAY - 1},
+            )
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={CONF_SCAN_INTERVAL: 2 * DEVICE_DELAY},
+        )
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert config_entry.data[CONF_SCAN_INTERVAL] == 2 * DEVICE_DELAY
+
+
+@pytest.mark.asyncio
+async def test_options_flow_add_derived(hass: HomeAssistant) -> None:
+    """Test that a derived value is added in the options."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="C.M.I",
+        data=DUMMY_CONFIG_ENTRY,
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.ta_cmi.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={"add_derived": True},
+        )
+
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "derived"
+
+        derived_input: dict[str, Any] = {
+            CONF_DERIVED_NAME: "Delta T",
+            CONF_DERIVED_FUNCTION: "difference",
+            CONF_DERIVED_NODE: "2",
+            CONF_DERIVED_CHANNEL_TYPE: "Input",
+            CONF_DERIVED_CHANNEL_ID: 1,
+        }
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input=derived_input
+        )
+
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {"base": "second_channel_required"}
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                **derived_input,
+                CONF_DERIVED_SECOND_CHANNEL_TYPE: "Input",
+                CONF_DERIVED_SECOND_CHANNEL_ID: 2,
+            },
+        )
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert config_entry.data[CONF_DERIVED] == [
+            {
+                CONF_DERIVED_ID: 1,
+                CONF_DERIVED_NAME: "Delta T",
+                CONF_DERIVED_FUNCTION: "difference",
+                CONF_DERIVED_NODE: "2",
+                CONF_DERIVED_CHANNEL_TYPE: "input",
+                CONF_DERIVED_CHANNEL_ID: 1,
+                CONF_DERIVED_WINDOW: 12,
+                CONF_DERIVED_SECOND_CHANNEL_TYPE: "input",
+                CONF_DERIVED_SECOND_CHANNEL_ID: 2,
+            }
+        ]
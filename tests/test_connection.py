@@ -0,0 +1,82 @@
+"""Test the HTTP connection to the C.M.I."""
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from ta_cmi import CMIAPI
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.connection import CMIConnection
+from custom_components.ta_cmi.const import DOMAIN
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+
+@pytest.mark.asyncio
+async def test_connection_records_timings(socket_enabled) -> None:
+    """Test that the requests are timed and the connection is kept alive."""
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.json_response(DUMMY_DEVICE_API_DATA)
+
+    app = web.Application()
+    app.router.add_get("/INCLUDE/api.cgi", handle)
+
+    connection = CMIConnection()
+
+    async with TestServer(app, host="127.0.0.1") as server:
+        api = CMIAPI(
+            str(server.make_url("")).rstrip("/"), "admin", "admin", connection.session
+        )
+
+        await api.get_device_data("2", "I,O")
+        await api.get_device_data("2", "I,O")
+
+        await connection.async_close()
+
+    data = connection.as_dict()
+
+    assert data["requests"] == 2
+    assert data["reused_connections"] == 1
+    assert data["average"]["total"] is not None
+
+    first, second = data["timings"]
+
+    assert first["connect"] is not None
+    assert not first["reused_connection"]
+    assert first["first_byte"] <= first["total"]
+    assert first["url"].endswith("/INCLUDE/api.cgi")
+
+    assert second["connect"] is None
+    assert second["reused_connection"]
+
+
+@pytest.mark.asyncio
+async def test_connection_closed_on_stop(hass: HomeAssistant) -> None:
+    """Test that the session is closed when Home Assistant stops."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        session = coordinator.connection.session
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+        await hass.async_block_till_done()
+
+        assert session.closed
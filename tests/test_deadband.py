@@ -0,0 +1,68 @@
+"""Test the deadband filter of the channel values."""
+from custom_components.ta_cmi.const import (
+    CONF_CHANNELS,
+    CONF_CHANNELS_DEADBAND,
+    CONF_CHANNELS_DEVICE_CLASS,
+    CONF_CHANNELS_ID,
+    CONF_CHANNELS_NAME,
+    CONF_CHANNELS_TYPE,
+    DEADBAND_MAX_AGE,
+)
+from custom_components.ta_cmi.deadband import DeadbandFilter
+
+KEY = ("INPUT", 1)
+
+
+def test_default_band_from_unit() -> None:
+    """Test that the band of the device class holds small changes back."""
+    deadband_filter = DeadbandFilter({}, use_defaults=True)
+
+    assert deadband_filter.filter(KEY, 20.0, "°C", None, now=0) == 20.0
+    assert deadband_filter.filter(KEY, 20.1, "°C", None, now=10) == 20.0
+    assert deadband_filter.filter(KEY, 19.9, "°C", None, now=20) == 20.0
+    assert deadband_filter.filter(KEY, 20.3, "°C", None, now=30) == 20.3
+
+    # Units without a default band are not filtered.
+    assert deadband_filter.filter(("INPUT", 2), 1.0, "km", None, now=0) == 1.0
+    assert deadband_filter.filter(("INPUT", 2), 1.1, "km", None, now=10) == 1.1
+
+
+def test_relative_band() -> None:
+    """Test that the relative band scales with the value."""
+    deadband_filter = DeadbandFilter({}, use_defaults=True)
+
+    assert deadband_filter.filter(KEY, 1000, "W", None, now=0) == 1000
+    assert deadband_filter.filter(KEY, 1015, "W", None, now=10) == 1000
+    assert deadband_filter.filter(KEY, 1025, "W", None, now=20) == 1025
+
+
+def test_max_age() -> None:
+    """Test that a held value is published after the max age."""
+    deadband_filter = DeadbandFilter({}, use_defaults=True)
+
+    deadband_filter.filter(KEY, 20.0, "°C", None, now=0)
+
+    assert deadband_filter.filter(KEY, 20.1, "°C", None, now=DEADBAND_MAX_AGE) == 20.1
+
+
+def test_channel_band() -> None:
+    """Test that a configured channel band is used without the defaults."""
+    deadband_filter = DeadbandFilter.from_device_config(
+        {
+            CONF_CHANNELS: [
+                {
+                    CONF_CHANNELS_TYPE: "input",
+                    CONF_CHANNELS_ID: 1,
+                    CONF_CHANNELS_NAME: "Temperature",
+                    CONF_CHANNELS_DEVICE_CLASS: "",
+                    CONF_CHANNELS_DEADBAND: 0.5,
+                }
+            ]
+        }
+    )
+
+    assert deadband_filter.filter(KEY, 20.0, "°C", None, now=0) == 20.0
+    assert deadband_filter.filter(KEY, 20.4, "°C", None, now=10) == 20.0
+    assert deadband_filter.filter(("INPUT", 2), 1.0, "°C", None, now=0) == 1.0
+    assert deadband_filter.filter(("INPUT", 2), 1.1, "°C", None, now=10) == 1.1
+    assert deadband_filter.filter(KEY, "on", "", None, now=20) == "on"
@@ -0,0 +1,164 @@
+"""Test the values derived from the channels."""
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import (
+    CONF_DERIVED,
+    CONF_DERIVED_CHANNEL_ID,
+    CONF_DERIVED_CHANNEL_TYPE,
+    CONF_DERIVED_FUNCTION,
+    CONF_DERIVED_ID,
+    CONF_DERIVED_NAME,
+    CONF_DERIVED_NODE,
+    CONF_DERIVED_SECOND_CHANNEL_ID,
+    CONF_DERIVED_SECOND_CHANNEL_TYPE,
+    CONF_DERIVED_WINDOW,
+    DERIVED_FUNCTION_DIFFERENCE,
+    DERIVED_FUNCTION_MAX,
+    DERIVED_FUNCTION_MEAN,
+    DERIVED_FUNCTION_MIN,
+    DERIVED_FUNCTION_RATE,
+    DOMAIN,
+    TYPE_DERIVED,
+    TYPE_SENSOR,
+)
+from custom_components.ta_cmi.derived import DerivedValueEngine, RingBuffer
+from custom_components.ta_cmi.device_parser import ChannelData
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+
+def _derived(
+    derived_id: int, function: str, window: int = 3, **extra: Any
+) -> dict[str, Any]:
+    """Create the configuration of a derived value of input 1 of node 2."""
+    return {
+        CONF_DERIVED_ID: derived_id,
+        CONF_DERIVED_NAME: function.title(),
+        CONF_DERIVED_FUNCTION: function,
+        CONF_DERIVED_NODE: "2",
+        CONF_DERIVED_CHANNEL_TYPE: "input",
+        CONF_DERIVED_CHANNEL_ID: 1,
+        CONF_DERIVED_WINDOW: window,
+        **extra,
+    }
+
+
+def _node_data(first: float, second: float) -> dict[str, Any]:
+    """Create the parsed data of a node with two inputs."""
+    return {
+        TYPE_SENSOR: {
+            "INPUT": {
+                1: ChannelData(first, "Input", "°C", None, None),
+                2: ChannelData(second, "Input", "°C", None, None),
+            }
+        }
+    }
+
+
+def test_ring_buffer() -> None:
+    """Test that the buffer keeps the latest values."""
+    buffer = RingBuffer(3)
+
+    assert buffer.latest() is None
+    assert buffer.first_and_last(3) is None
+
+    for timestamp, value in enumerate([1.0, 2.0, 3.0, 4.0]):
+        buffer.append(timestamp, value)
+
+    assert buffer.count == 3
+    assert buffer.latest() == 4.0
+    assert list(buffer.window(3)) == [4.0, 3.0, 2.0]
+    assert list(buffer.window(2)) == [4.0, 3.0]
+    assert buffer.first_and_last(3) == ((1, 2.0), (3, 4.0))
+
+
+def test_engine_computes_derived_values() -> None:
+    """Test that all derived values of a node are computed in one pass."""
+    engine = DerivedValueEngine(
+        [
+            _derived(
+                1,
+                DERIVED_FUNCTION_DIFFERENCE,
+                **{
+                    CONF_DERIVED_SECOND_CHANNEL_TYPE: "input",
+                    CONF_DERIVED_SECOND_CHANNEL_ID: 2,
+                },
+            ),
+            _derived(2, DERIVED_FUNCTION_RATE),
+            _derived(3, DERIVED_FUNCTION_MIN),
+            _derived(4, DERIVED_FUNCTION_MAX),
+            _derived(5, DERIVED_FUNCTION_MEAN),
+        ]
+    )
+
+    assert engine.process("5", _node_data(1, 1), 0) == {}
+
+    result = engine.process("2", _node_data(60.0, 40.0), 0)
+
+    assert result[1].value == 20.0
+    assert result[1].device_class is None
+    assert result[2].value is None
+    assert result[2].unit == "°C/h"
+    assert result[3].value == 60.0
+    assert result[3].device_class == "temperature"
+
+    engine.process("2", _node_data(61.0, 40.0), 600)
+    engine.process("2", _node_data(62.0, 41.0), 1200)
+    result = engine.process("2", _node_data(66.0, 42.0), 1800)
+
+    assert result[1].value == 24.0
+    assert result[2].value == 15.0
+    assert result[3].value == 61.0
+    assert result[4].value == 66.0
+    assert result[5].value == 63.0
+    assert result[5].mode == "Derived"
+    assert result[5].name == "Mean"
+
+
+@pytest.mark.asyncio
+async def test_derived_sensor(hass: HomeAssistant) -> None:
+    """Test that the derived values are created as sensors."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN,
+            title="NINA",
+            data={
+                **ENTRY_DATA,
+                CONF_DERIVED: [
+                    _derived(
+                        1,
+                        DERIVED_FUNCTION_DIFFERENCE,
+                        **{
+                            CONF_DERIVED_SECOND_CHANNEL_TYPE: "input",
+                            CONF_DERIVED_SECOND_CHANNEL_ID: 2,
+                        },
+                    )
+                ],
+            },
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        assert coordinator.data["2"][TYPE_DERIVED][1].value == -0.1
+        assert coordinator.data["5"][TYPE_DERIVED] == {}
+
+        state = hass.states.get("sensor.uvr16x2_difference")
+
+        assert state.state == "-0.1"
+        assert "device_class" not in state.attributes
@@ -0,0 +1,124 @@
+"""Test the Technische Alternative C.M.I. device parser."""
+from datetime import timedelta
+import asyncio
+import gc
+import os
+import traceback
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import (
+    CONF_CHANNELS,
+    CONF_DEVICE_FETCH_MODE,
+    CONF_DEVICE_ID,
+    DERIVED_FUNCTION_MEAN,
+    DERIVED_MAX_WINDOW,
+    TYPE_DERIVED,
+    TYPE_SENSOR,
+)
+from custom_components.ta_cmi.derived import DerivedValueEngine
+from custom_components.ta_cmi.device_parser import ChannelData
+from custom_components.ta_cmi.rate_limit import HostRateLimiter
+
+from . import sleep_mock
+from .test_derived import _derived
+from .test_sensor import DUMMY_DEVICE_API_DATA
+
+MAX_RETAINED_BYTES_PER_CHANNEL = 1000
+MAX_GROWTH_BYTES_PER_CHANNEL = 2
+CYCLES = 10
+
+# The debug mode of the test loop keeps a traceback of every scheduled handle.
+LOOP_TRACES = [
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(asyncio.__file__), "*")),
+    tracemalloc.Filter(False, traceback.__file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+]
+
+
+def _retained_memory() -> int:
+    """Return the size of the traced memory that was not allocated by the event loop."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(LOOP_TRACES)
+
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def _api_data(channels: int, cycle: int) -> dict[str, Any]:
+    """Create the API data of a node with the given number of inputs."""
+    return {
+        **DUMMY_DEVICE_API_DATA,
+        "Data": {
+            "Inputs": [
+                {
+                    "Number": number,
+                    "AD": "A",
+                    "Value": {"Value": number + cycle, "Unit": "1"},
+                }
+                for number in range(1, channels + 1)
+            ]
+        },
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("channels", [1_000, 10_000])
+async def test_snapshot_memory(hass: HomeAssistant, channels: int) -> None:
+    """Test that the snapshots are small and do not grow with every cycle."""
+    cycle: int = 0
+
+    class API:
+        """Return new values in every cycle without recording the calls like a mock."""
+
+        async def get_device_data(self, node_id: str, parameter: str) -> dict[str, Any]:
+            return _api_data(channels, cycle)
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        baseline = _retained_memory()
+        retained: list[int] = []
+
+        with patch("asyncio.sleep", sleep_mock), patch.object(
+            CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+        ):
+            # The deadband filter and the ring buffers keep state across cycles.
+            coordinator = CMIDataUpdateCoordinator(
+                hass,
+                "http://192.168.2.101",
+                "",
+                "",
+                [{CONF_DEVICE_ID: "2", CONF_DEVICE_FETCH_MODE: "all", CONF_CHANNELS: []}],
+                timedelta(minutes=10),
+                cmi_api=API(),
+                deadband_defaults=True,
+            )
+            coordinator.rate_limiter = HostRateLimiter(coordinator.host, delay=0)
+            coordinator.derived_engine = DerivedValueEngine(
+                [_derived(1, DERIVED_FUNCTION_MEAN, DERIVED_MAX_WINDOW)]
+            )
+
+            for cycle in range(CYCLES):
+                await coordinator.async_refresh()
+
+                assert coordinator.last_update_success
+
+                gc.collect()
+                retained.append(_retained_memory() - baseline)
+    finally:
+        tracemalloc.stop()
+
+    inputs = coordinator.data["2"][TYPE_SENSOR]["INPUT"]
+
+    assert len(inputs) == channels
+    assert isinstance(inputs[1], ChannelData)
+    assert inputs[1].value == CYCLES
+    assert coordinator.data["2"][TYPE_DERIVED][1].value is not None
+
+    assert retained[-1] / channels < MAX_RETAINED_BYTES_PER_CHANNEL
+    assert (retained[-1] - retained[1]) / channels < MAX_GROWTH_BYTES_PER_CHANNEL
@@ -0,0 +1,87 @@
+"""Test the Technische Alternative C.M.I. diagnostics."""
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import DOMAIN
+from custom_components.ta_cmi.diagnostics import (
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+
+async def _setup_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up a config entry with the dummy device data."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+    return conf_entry
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
+    """Test the diagnostics of a config entry."""
+    conf_entry = await _setup_entry(hass)
+
+    result = await async_get_config_entry_diagnostics(hass, conf_entry)
+
+    assert result["host"] == "http://192.168.2.101"
+    assert not result["truncated"]
+    assert set(result["node_status"]) == {"2", "5"}
+    assert result["connection"]["requests"] == 0
+    assert len(result["devices"]) == 2
+
+    device = result["devices"][0]
+
+    assert device["name"] == "UVR16x2"
+    assert device["state"]["sensor"]["INPUT"][1] == {
+        "value": 92.2,
+        "mode": "Input",
+        "unit": "°C",
+        "name": "Input 1",
+        "device_class": "temperature",
+    }
+
+
+@pytest.mark.asyncio
+async def test_device_diagnostics(hass: HomeAssistant) -> None:
+    """Test the diagnostics of a single device."""
+    conf_entry = await _setup_entry(hass)
+
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, "http://192.168.2.101", "2")}
+    )
+
+    result = await async_get_device_diagnostics(hass, conf_entry, device)
+
+    assert result["name"] == "UVR16x2"
+    assert "channel" not in result["state"]["sensor"]["INPUT"][1]
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_size_cap(hass: HomeAssistant) -> None:
+    """Test that the diagnostics are truncated if they get too large."""
+    conf_entry = await _setup_entry(hass)
+
+    with patch("custom_components.ta_cmi.diagnostics.DIAGNOSTICS_MAX_VALUES", 10):
+        result = await async_get_config_entry_diagnostics(hass, conf_entry)
+
+    assert result["truncated"]
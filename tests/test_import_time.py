@@ -0,0 +1,69 @@
+"""Test the import of the integration."""
+from pathlib import Path
+import subprocess
+import sys
+
+# The import takes about 25 ms after the modules of Home Assistant are loaded.
+IMPORT_TIME_BUDGET = 0.1
+
+# The modules of the integration that are needed to import it.
+EAGER_MODULES: tuple[str, ...] = (
+    "custom_components.ta_cmi",
+    "custom_components.ta_cmi.const",
+    "custom_components.ta_cmi.device_parser",
+    "custom_components.ta_cmi.snapshot",
+)
+
+LAZY_MODULES: tuple[str, ...] = (
+    "custom_components.ta_cmi.capture",
+    "custom_components.ta_cmi.coe_transmit",
+    "custom_components.ta_cmi.config_flow",
+    "custom_components.ta_cmi.deadband",
+    "custom_components.ta_cmi.derived",
+    "custom_components.ta_cmi.diagnostics",
+    "custom_components.ta_cmi.profiler",
+    "custom_components.ta_cmi.statistics",
+    "homeassistant.components.recorder",
+)
+
+# Home Assistant has loaded these modules before an integration is imported.
+SCRIPT = f"""
+import sys
+import aiohttp
+import homeassistant.core
+import homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.config_validation
+import homeassistant.helpers.update_coordinator
+import custom_components.ta_cmi
+print(*[name for name in {LAZY_MODULES!r} if name in sys.modules])
+print(*sorted(name for name in sys.modules if name.startswith("custom_components.ta_cmi")))
+"""
+
+
+def test_import_time() -> None:
+    """Test that the integration imports fast and loads optional modules lazily."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    lazy_loaded, eager_loaded = result.stdout.splitlines()
+
+    assert lazy_loaded == ""
+    assert eager_loaded.split() == list(EAGER_MODULES)
+
+    cumulative: dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, total, name = line.split("|")
+
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+
+    assert cumulative["custom_components.ta_cmi"] < IMPORT_TIME_BUDGET * 1_000_000
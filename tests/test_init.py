@@ -0,0 +1,374 @@
+"""Test the Technische Alternative C.M.I. coordinator."""
+from copy import deepcopy
+from datetime import timedelta
+import time
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from ta_cmi import ApiError
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import (
+    CONF_CHANNELS,
+    CONF_CHANNELS_NAME,
+    CONF_DEVICES,
+    CONF_SCAN_INTERVAL,
+    DOMAIN,
+    TYPE_SENSOR,
+)
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+
+def _device_data_with_failed_nodes(failed_nodes: set[str]):
+    """Create a side effect that fails the requests to the given nodes."""
+
+    async def get_device_data(node_id: str, parameter: str) -> dict[str, Any]:
+        if node_id in failed_nodes:
+            raise ApiError("Node not available")
+        return DUMMY_DEVICE_API_DATA
+
+    return get_device_data
+
+
+@pytest.mark.asyncio
+async def test_partial_update_failure(hass: HomeAssistant) -> None:
+    """Test that a failing node does not mark the other nodes unavailable."""
+    failed_nodes: set[str] = set()
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data",
+        side_effect=_device_data_with_failed_nodes(failed_nodes),
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state == ConfigEntryState.LOADED
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        failed_nodes.add("5")
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert coordinator.last_update_success
+        assert not coordinator.node_status["5"].available
+        assert coordinator.node_status["5"].consecutive_failures == 1
+        assert "5" in coordinator.data
+        assert hass.states.get("sensor.uvr16x2_input_1").state == "92.2"
+
+        failed_nodes.clear()
+        failed_nodes.add("2")
+        coordinator.node_status["5"].next_attempt = 0
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert coordinator.last_update_success
+        assert coordinator.node_status["5"].available
+        assert hass.states.get("sensor.uvr16x2_input_1").state == STATE_UNAVAILABLE
+        assert (
+            hass.states.get("binary_sensor.uvr16x2_output_1").state
+            == STATE_UNAVAILABLE
+        )
+
+
+@pytest.mark.asyncio
+async def test_node_failed_on_setup(hass: HomeAssistant) -> None:
+    """Test that the setup is retried until every node answered once."""
+    failed_nodes: set[str] = {"2"}
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data",
+        side_effect=_device_data_with_failed_nodes(failed_nodes),
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state == ConfigEntryState.SETUP_RETRY
+        assert hass.states.get("sensor.uvr16x2_input_1") is None
+
+        failed_nodes.clear()
+
+        await hass.config_entries.async_reload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state == ConfigEntryState.LOADED
+        assert hass.states.get("sensor.uvr16x2_input_1").state == "92.2"
+
+
+@pytest.mark.asyncio
+async def test_failed_node_backoff(hass: HomeAssistant) -> None:
+    """Test that a failed node is skipped until its backoff expired."""
+    failed_nodes: set[str] = set()
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data",
+        side_effect=_device_data_with_failed_nodes(failed_nodes),
+    ) as data_m, patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        status = coordinator.node_status["5"]
+
+        failed_nodes.add("5")
+
+        await coordinator.async_refresh()
+
+        assert status.consecutive_failures == 1
+        assert status.next_attempt > time.time()
+
+        data_m.reset_mock()
+
+        await coordinator.async_refresh()
+
+        assert {call.args[0] for call in data_m.call_args_list} == {"2"}
+        assert status.consecutive_failures == 1
+
+        for _ in range(4):
+            status.next_attempt = 0
+            await coordinator.async_refresh()
+
+        assert status.circuit_open
+        assert status.next_attempt > time.time() + 60 * 60
+
+        failed_nodes.clear()
+        status.next_attempt = 0
+
+        await coordinator.async_refresh()
+
+        assert status.available
+        assert not status.circuit_open
+
+
+@pytest.mark.asyncio
+async def test_update_failure_all_nodes(hass: HomeAssistant) -> None:
+    """Test that the update fails if no node could be updated."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data",
+        side_effect=_device_data_with_failed_nodes({"2", "5"}),
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state == ConfigEntryState.SETUP_RETRY
+
+
+@pytest.mark.asyncio
+async def test_timed_out_node_retried(hass: HomeAssistant) -> None:
+    """Test that a timed out node is retried once at the end of the update."""
+    timed_out_nodes: list[str] = []
+
+    async def get_device_data(node_id: str, parameter: str) -> dict[str, Any]:
+        if node_id in timed_out_nodes:
+            timed_out_nodes.remove(node_id)
+            raise TimeoutError
+        return DUMMY_DEVICE_API_DATA
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", side_effect=get_device_data
+    ) as data_m, patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        data_m.reset_mock()
+        timed_out_nodes.append("2")
+
+        await coordinator.async_refresh()
+
+        calls = [call.args[0] for call in data_m.call_args_list]
+        assert calls == ["2", "5", "5", "2", "2"]
+        assert coordinator.node_status["2"].available
+        assert coordinator.latency["2"].timeouts == 1
+
+        timed_out_nodes.extend(["2", "2"])
+
+        await coordinator.async_refresh()
+
+        assert not coordinator.node_status["2"].available
+        assert coordinator.latency["2"].consecutive_timeouts == 2
+
+
+@pytest.mark.asyncio
+async def test_options_applied_in_place(hass: HomeAssistant) -> None:
+    """Test that the scan interval and channel names are applied without reload."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ) as data_m, patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=deepcopy(ENTRY_DATA)
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        data_m.reset_mock()
+
+        # The entry was created without the options that were added later.
+        with patch.object(hass.config_entries, "async_reload") as reload_m:
+            result = await hass.config_entries.options.async_init(conf_entry.entry_id)
+            result = await hass.config_entries.options.async_configure(
+                result["flow_id"], user_input={CONF_SCAN_INTERVAL: 1200}
+            )
+            await hass.async_block_till_done()
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+
+        reload_m.assert_not_called()
+        data_m.assert_not_called()
+
+        assert hass.data[DOMAIN][conf_entry.entry_id] is coordinator
+        assert coordinator.update_interval == timedelta(seconds=1200)
+
+        # The channels are not part of the options flow.
+        data: dict[str, Any] = deepcopy(dict(conf_entry.data))
+        data[CONF_DEVICES][0][CONF_CHANNELS][0][CONF_CHANNELS_NAME] = "Boiler"
+
+        with patch.object(hass.config_entries, "async_reload") as reload_m:
+            hass.config_entries.async_update_entry(conf_entry, data=data)
+            await hass.async_block_till_done()
+
+        reload_m.assert_not_called()
+        data_m.assert_not_called()
+
+        assert coordinator.data["2"][TYPE_SENSOR]["INPUT"][1].name == "Boiler"
+
+        state = hass.states.get("sensor.uvr16x2_input_1")
+        assert state.state == "92.2"
+        assert state.attributes["friendly_name"].endswith("Boiler")
+
+        with patch.object(hass.config_entries, "async_reload") as reload_m, patch(
+            "ta_cmi.cmi_api.CMIAPI._make_request_no_json", return_value="2;"
+        ):
+            result = await hass.config_entries.options.async_init(conf_entry.entry_id)
+            result = await hass.config_entries.options.async_configure(
+                result["flow_id"],
+                user_input={
+                    CONF_SCAN_INTERVAL: 1200,
+                    CONF_HOST: "http://192.168.2.102",
+                },
+            )
+            await hass.async_block_till_done()
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+
+        reload_m.assert_called_once_with(conf_entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_migrate_scan_interval_to_seconds(hass: HomeAssistant) -> None:
+    """Test that the scan interval of version 1 is migrated to seconds."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN,
+            title="NINA",
+            data={**ENTRY_DATA, CONF_SCAN_INTERVAL: 15},
+            version=1,
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        assert conf_entry.version == 2
+        assert conf_entry.data[CONF_SCAN_INTERVAL] == 900
+        assert coordinator.update_interval == timedelta(minutes=15)
+
+
+@pytest.mark.asyncio
+async def test_device_info_updated(hass: HomeAssistant) -> None:
+    """Test that a new API version of a node is written to the device registry."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        device_registry = dr.async_get(hass)
+        identifiers = {(DOMAIN, "http://192.168.2.101", "2")}
+
+        sw_version = device_registry.async_get_device(identifiers=identifiers).sw_version
+
+        # The node reports a new API version after a firmware update.
+        next(dev for dev in coordinator.devices if dev.id == "2").api_version = 6
+
+        await coordinator.async_refresh()
+
+        device = device_registry.async_get_device(identifiers=identifiers)
+
+        assert sw_version != 6
+        assert device.sw_version == 6
@@ -0,0 +1,61 @@
+"""Test the latency based timeouts of the C.M.I. requests."""
+import pytest
+
+from custom_components.ta_cmi.const import (
+    LATENCY_MIN_SAMPLES,
+    LATENCY_TIMEOUT_CEILING,
+    LATENCY_TIMEOUT_FACTOR,
+    LATENCY_TIMEOUT_FLOOR,
+)
+from custom_components.ta_cmi.latency import LatencyTracker
+
+
+def test_timeout_without_samples() -> None:
+    """Test that the ceiling is used until enough requests were measured."""
+    tracker = LatencyTracker()
+
+    for _ in range(LATENCY_MIN_SAMPLES - 1):
+        tracker.add(1)
+
+    assert tracker.percentile is None
+    assert tracker.timeout() == LATENCY_TIMEOUT_CEILING
+
+
+@pytest.mark.parametrize(
+    ("duration", "expected"),
+    [
+        (0.1, LATENCY_TIMEOUT_FLOOR),
+        (2.5, 2.5 * LATENCY_TIMEOUT_FACTOR),
+        (100, LATENCY_TIMEOUT_CEILING),
+    ],
+)
+def test_timeout_from_percentile(duration: float, expected: float) -> None:
+    """Test that the timeout follows the percentile within the limits."""
+    tracker = LatencyTracker()
+
+    for _ in range(LATENCY_MIN_SAMPLES):
+        tracker.add(duration)
+
+    assert tracker.timeout() == expected
+
+
+def test_timeout_after_timeout() -> None:
+    """Test that a timed out node gets one retry with the ceiling."""
+    tracker = LatencyTracker()
+
+    for _ in range(LATENCY_MIN_SAMPLES):
+        tracker.add(1)
+
+    tracker.add_timeout()
+
+    assert tracker.should_retry()
+    assert tracker.timeout() == LATENCY_TIMEOUT_CEILING
+
+    tracker.add_timeout()
+
+    assert not tracker.should_retry()
+
+    tracker.add(1)
+
+    assert tracker.consecutive_timeouts == 0
+    assert tracker.timeout() == LATENCY_TIMEOUT_FLOOR
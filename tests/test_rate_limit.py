@@ -0,0 +1,64 @@
+"""Test the request scheduling of the Technische Alternative C.M.I. integration."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.ta_cmi.const import CONF_DEVICE_TYPE, DEVICE_DELAY
+from custom_components.ta_cmi.rate_limit import (
+    CMIScheduler,
+    HostRateLimiter,
+    async_get_rate_limiter,
+    async_get_scheduler,
+    get_minimum_scan_interval,
+)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrent_requests() -> None:
+    """Test that the scheduler runs hosts in parallel up to the global limit."""
+    scheduler = CMIScheduler(max_concurrent=2)
+    limiters = [HostRateLimiter(f"http://host{i}", delay=0) for i in range(4)]
+
+    release = asyncio.Event()
+    max_in_flight = 0
+
+    async def request(limiter: HostRateLimiter) -> None:
+        nonlocal max_in_flight
+        async with scheduler.async_request(limiter):
+            max_in_flight = max(max_in_flight, scheduler.in_flight)
+            await release.wait()
+
+    tasks = [asyncio.create_task(request(limiter)) for limiter in limiters]
+    await asyncio.sleep(0)
+
+    assert scheduler.in_flight == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert max_in_flight == 2
+    assert scheduler.in_flight == 0
+    assert all(limiter.last_request > 0 for limiter in limiters)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_shared_per_host(hass: HomeAssistant) -> None:
+    """Test that every host has a single rate limiter in the shared scheduler."""
+    limiter = async_get_rate_limiter(hass, "http://localhost")
+
+    assert async_get_rate_limiter(hass, "http://localhost") is limiter
+    assert async_get_rate_limiter(hass, "http://other") is not limiter
+    assert async_get_scheduler(hass).rate_limiters["http://localhost"] is limiter
+
+
+def test_minimum_scan_interval() -> None:
+    """Test that the minimum scan interval covers the requests of all nodes."""
+    assert get_minimum_scan_interval([]) == DEVICE_DELAY
+    assert get_minimum_scan_interval([{CONF_DEVICE_TYPE: "UVR1611"}]) == DEVICE_DELAY
+    assert (
+        get_minimum_scan_interval(
+            [{CONF_DEVICE_TYPE: "UVR16x2"}, {CONF_DEVICE_TYPE: "RSM610"}]
+        )
+        == 3 * DEVICE_DELAY
+    )
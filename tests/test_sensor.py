@@ -13,7 +13,18 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from ta_cmi import InvalidCredentialsError
 
 from custom_components.ta_cmi import CMIDataUpdateCoordinator
-from custom_components.ta_cmi.const import DOMAIN, NEW_UID
+from custom_components.ta_cmi.binary_sensor import DeviceChannelBinary
+from custom_components.ta_cmi.const import (
+    CONF_STATISTICS_CHANNEL_TYPES,
+    CONF_STATISTICS_ENTITY_MODE,
+    DOMAIN,
+    NEW_UID,
+    STATISTICS_ENTITY_MODE_DISABLED,
+    STATISTICS_ENTITY_MODE_ENABLED,
+    STATISTICS_ENTITY_MODE_NONE,
+)
+from custom_components.ta_cmi.sensor import DeviceChannelSensor
+from custom_components.ta_cmi.statistics import ChannelStatisticsCollector
 
 from . import sleep_mock
 
@@ -358,3 +369,140 @@ async def test_sensors_invalid_credentials(hass: HomeAssistant) -> None:
         await hass.async_block_till_done()
 
         assert conf_entry.state == ConfigEntryState.SETUP_RETRY
+
+
+@pytest.mark.asyncio
+async def test_device_info_cached(hass: HomeAssistant) -> None:
+    """Test that the device info is only rebuilt if the device details change."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_devices_ids",
+        return_value=["2"],
+    ), patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        device_info = coordinator.device_infos["2"]
+
+        assert device_info["identifiers"] == {(DOMAIN, "http://192.168.2.101", "2")}
+        assert device_info["name"] == "UVR16x2"
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert coordinator.device_infos["2"] is device_info
+
+
+@pytest.mark.asyncio
+async def test_sensors_skip_unchanged_state_write(hass: HomeAssistant) -> None:
+    """Test that the state is only written if the channel data changed."""
+    changed_data = copy.deepcopy(DUMMY_DEVICE_API_DATA)
+    changed_data["Data"]["Inputs"][0]["Value"]["Value"] = 50.1
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_devices_ids",
+        return_value=["2"],
+    ), patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ) as data_m, patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        with patch.object(
+            DeviceChannelSensor, "async_write_ha_state"
+        ) as sensor_write_m, patch.object(
+            DeviceChannelBinary, "async_write_ha_state"
+        ) as binary_write_m:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+            sensor_write_m.assert_not_called()
+            binary_write_m.assert_not_called()
+
+            data_m.return_value = changed_data
+
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+            sensor_write_m.assert_called_once()
+            binary_write_m.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("entity_mode", "registered", "disabled", "imported"),
+    [
+        (STATISTICS_ENTITY_MODE_ENABLED, True, False, False),
+        (STATISTICS_ENTITY_MODE_DISABLED, True, True, True),
+        (STATISTICS_ENTITY_MODE_NONE, False, False, True),
+    ],
+)
+async def test_sensors_statistics_entity_mode(
+    hass: HomeAssistant,
+    entity_mode: str,
+    registered: bool,
+    disabled: bool,
+    imported: bool,
+) -> None:
+    """Test the entities of channel types that are imported into the statistics."""
+    entry_data = copy.deepcopy(ENTRY_DATA)
+    entry_data[CONF_STATISTICS_CHANNEL_TYPES] = ["analog logging"]
+    entry_data[CONF_STATISTICS_ENTITY_MODE] = entity_mode
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_devices_ids",
+        return_value=["2"],
+    ), patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ), patch(
+        "custom_components.ta_cmi.statistics.async_add_external_statistics"
+    ), patch(
+        "custom_components.ta_cmi.statistics.ChannelStatisticsCollector",
+        wraps=ChannelStatisticsCollector,
+    ) as collector_m:
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=entry_data
+        )
+
+        entity_registry: er = er.async_get(hass)
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state == ConfigEntryState.LOADED
+        assert collector_m.called == imported
+
+        entry_al1 = entity_registry.async_get("sensor.uvr16x2_analog_1")
+
+        assert (entry_al1 is not None) == registered
+        if entry_al1 is not None:
+            assert entry_al1.disabled == disabled
+
+        assert entity_registry.async_get("sensor.uvr16x2_input_1") is not None
+        assert (
+            entity_registry.async_get("binary_sensor.uvr16x2_node_2_analog_logging_3")
+            is not None
+        )
@@ -0,0 +1,194 @@
+"""Test the services of the Technische Alternative C.M.I. integration."""
+import asyncio
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import DOMAIN, TYPE_SENSOR
+from custom_components.ta_cmi.services import (
+    EVENT_PROFILE_FINISHED,
+    SERVICE_PROFILE_CYCLE,
+    SERVICE_REFRESH_NODE,
+)
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+# The tests replace asyncio.sleep, but still have to let queued tasks run.
+real_sleep = asyncio.sleep
+
+
+@pytest.mark.asyncio
+async def test_refresh_node(hass: HomeAssistant) -> None:
+    """Test that a single node is refreshed on demand."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ) as data_m, patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        coordinator.rate_limiter.last_request = 0
+
+        device = dr.async_get(hass).async_get_device(
+            identifiers={(DOMAIN, coordinator.host, "2")}
+        )
+
+        data_m.reset_mock()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_REFRESH_NODE,
+            {ATTR_DEVICE_ID: device.id},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert response["queue_position"] == 0
+        assert dt_util.parse_datetime(response["expected_completion"]) is not None
+
+        await hass.async_block_till_done()
+
+        assert {call.args[0] for call in data_m.call_args_list} == {"2"}
+        assert coordinator.rate_limiter.queued == 0
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_REFRESH_NODE,
+                {ATTR_DEVICE_ID: "unknown"},
+                blocking=True,
+                return_response=True,
+            )
+
+        await hass.config_entries.async_unload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_REFRESH_NODE,
+                {ATTR_DEVICE_ID: device.id},
+                blocking=True,
+                return_response=True,
+            )
+
+
+@pytest.mark.asyncio
+async def test_refresh_node_during_cycle(hass: HomeAssistant) -> None:
+    """Test that a refresh queued behind a cycle keeps the data of the cycle."""
+    entry_data: dict[str, Any] = deepcopy(ENTRY_DATA)
+    entry_data["devices"][1]["fetchmode"] = "all"
+    values: dict[str, float] = {"2": 92.2, "5": 92.2}
+    waiting = asyncio.Event()
+    release = asyncio.Event()
+    release.set()
+
+    async def get_device_data(node_id: str, parameter: str) -> dict[str, Any]:
+        if node_id == "5" and not release.is_set():
+            waiting.set()
+            await release.wait()
+
+        data = deepcopy(DUMMY_DEVICE_API_DATA)
+        data["Data"]["Inputs"][0]["Value"]["Value"] = values[node_id]
+        return data
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", side_effect=get_device_data
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=entry_data
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        release.clear()
+        values["5"] = 11.1
+
+        cycle = hass.async_create_task(coordinator.async_refresh())
+
+        # The cycle waits for the response of its last node.
+        await waiting.wait()
+
+        coordinator.async_request_node_refresh("2")
+
+        while coordinator.rate_limiter.queued < 2:
+            await real_sleep(0)
+
+        release.set()
+        await cycle
+        await hass.async_block_till_done()
+
+        assert coordinator.rate_limiter.queued == 0
+        assert coordinator.data["5"][TYPE_SENSOR]["INPUT"][1].value == 11.1
+
+
+@pytest.mark.asyncio
+async def test_profile_cycle(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that the phases of an update cycle are profiled."""
+    hass.config.config_dir = str(tmp_path)
+    events = async_capture_events(hass, EVENT_PROFILE_FINISHED)
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE_CYCLE,
+            {"config_entry_id": conf_entry.entry_id, "cycles": 2},
+            blocking=True,
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.data[DOMAIN][conf_entry.entry_id].profiler is None
+    assert len(events) == 1
+
+    files = [Path(file) for file in events[0].data["files"]]
+
+    assert sorted(file.name.rsplit("_", 1)[-1] for file in files) == [
+        "dispatch.prof",
+        "fetch.prof",
+        "parse.prof",
+        "summary.txt",
+    ]
+    assert all(file.parent == tmp_path / DOMAIN / "profiles" for file in files)
+    assert "===== parse (4 calls) =====" in files[-1].read_text()
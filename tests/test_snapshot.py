@@ -0,0 +1,85 @@
+"""Test the snapshots of the node data."""
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import DOMAIN, TYPE_SENSOR
+from custom_components.ta_cmi.device_parser import ChannelData
+from custom_components.ta_cmi.snapshot import Snapshot
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+
+def _node_data(value: float) -> dict[str, Any]:
+    """Create the parsed data of a node with one input and one output."""
+    return {
+        TYPE_SENSOR: {
+            "INPUT": {1: ChannelData(value, "Input", "°C", None, None)},
+            "OUTPUT": {1: ChannelData(0, "Output", "", None, None)},
+        }
+    }
+
+
+def test_snapshot_shares_unchanged_nodes() -> None:
+    """Test that unchanged nodes are shared and keep their version."""
+    first = Snapshot().evolve({"1": _node_data(20.0), "2": _node_data(30.0)})
+
+    assert first.version == 1
+    assert first.node_version("1") == 1
+    assert isinstance(first["1"], MappingProxyType)
+    assert isinstance(first["1"][TYPE_SENSOR], MappingProxyType)
+
+    with pytest.raises(TypeError):
+        first["1"][TYPE_SENSOR]["INPUT"][2] = None
+
+    second = first.evolve({"1": _node_data(20.0), "2": _node_data(31.0)})
+
+    assert second.version == 2
+    assert second["1"] is first["1"]
+    assert second.node_version("1") == 1
+    assert second.node_version("2") == 2
+    assert second["2"][TYPE_SENSOR]["OUTPUT"] is first["2"][TYPE_SENSOR]["OUTPUT"]
+    assert second["2"][TYPE_SENSOR]["INPUT"][1].value == 31.0
+    assert first["2"][TYPE_SENSOR]["INPUT"][1].value == 30.0
+
+    assert second.evolve({"1": _node_data(20.0), "2": _node_data(31.0)}) is second
+
+    third = second.evolve({"1": second["1"]})
+
+    assert third.version == 3
+    assert "2" not in third
+    assert third.node_version("1") == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinator_snapshot_versions(hass: HomeAssistant) -> None:
+    """Test that an update with the same data keeps the snapshot."""
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        snapshot: Snapshot = coordinator.data
+
+        assert isinstance(snapshot, Snapshot)
+        assert snapshot.node_version("2") == snapshot.version
+
+        await coordinator.async_refresh()
+
+        assert coordinator.data is snapshot
@@ -0,0 +1,117 @@
+"""Test the Technische Alternative C.M.I. statistics."""
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.ta_cmi.const import DEVICE_TYPE, TYPE_BINARY, TYPE_SENSOR
+from custom_components.ta_cmi.device_parser import ChannelData
+from custom_components.ta_cmi.statistics import ChannelStatisticsCollector
+
+
+def _snapshot(value: Any) -> dict[str, Any]:
+    """Create a coordinator snapshot with one logging channel."""
+    return {
+        "2": {
+            DEVICE_TYPE: "UVR16x2",
+            TYPE_BINARY: {},
+            TYPE_SENSOR: {
+                "ANALOG_LOGGING": {
+                    1: ChannelData(value, "Analog-Logging", "°C", None, None)
+                },
+                "INPUT": {1: ChannelData(10, "Input", "°C", None, None)},
+            },
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_hourly_statistics_import(hass: HomeAssistant) -> None:
+    """Test that the values of an hour are imported as one statistic row."""
+    coordinator = MagicMock(host="http://192.168.2.101")
+    coordinator.is_node_available.return_value = True
+
+    collector = ChannelStatisticsCollector(hass, coordinator, ["analog logging"])
+
+    hour_start: datetime = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    with patch(
+        "custom_components.ta_cmi.statistics.async_add_external_statistics"
+    ) as import_m:
+        collector.async_add_snapshot(_snapshot(10.0), hour_start)
+        collector.async_add_snapshot(_snapshot(20.0), hour_start + timedelta(minutes=20))
+        collector.async_add_snapshot(_snapshot(30.0), hour_start + timedelta(minutes=40))
+
+        import_m.assert_not_called()
+
+        collector.async_add_snapshot(_snapshot(5.0), hour_start + timedelta(hours=1))
+
+        import_m.assert_called_once()
+
+        _, metadata, statistics = import_m.call_args.args
+
+        assert metadata["statistic_id"] == (
+            "ta_cmi:http_192_168_2_101_2_analog_logging_1"
+        )
+        assert metadata["unit_of_measurement"] == "°C"
+        assert metadata["name"] == "UVR16x2 Analog-Logging 1"
+        assert statistics == [
+            {"start": hour_start, "mean": 20.0, "min": 10.0, "max": 30.0}
+        ]
+
+
+@pytest.mark.asyncio
+async def test_statistics_skip_unavailable_node(hass: HomeAssistant) -> None:
+    """Test that the stale values of an unavailable node are not aggregated."""
+    coordinator = MagicMock(host="http://192.168.2.101")
+    coordinator.is_node_available.return_value = False
+
+    collector = ChannelStatisticsCollector(hass, coordinator, ["analog logging"])
+
+    hour_start: datetime = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    with patch(
+        "custom_components.ta_cmi.statistics.async_add_external_statistics"
+    ) as import_m:
+        collector.async_add_snapshot(_snapshot(10.0), hour_start)
+        collector.async_add_snapshot(_snapshot(5.0), hour_start + timedelta(hours=1))
+
+        import_m.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_statistics_once_per_cycle(hass: HomeAssistant) -> None:
+    """Test that only the updates of a new cycle are aggregated."""
+    coordinator = MagicMock(
+        host="http://192.168.2.101", last_update_success=True, cycles=1
+    )
+    coordinator.is_node_available.return_value = True
+
+    collector = ChannelStatisticsCollector(hass, coordinator, ["analog logging"])
+
+    hour_start: datetime = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    with patch(
+        "custom_components.ta_cmi.statistics.async_add_external_statistics"
+    ) as import_m, patch(
+        "custom_components.ta_cmi.statistics.dt_util.utcnow", return_value=hour_start
+    ):
+        coordinator.data = _snapshot(10.0)
+        collector.async_handle_update()
+
+        # A refreshed node notifies the listeners within the same cycle.
+        coordinator.data = _snapshot(50.0)
+        collector.async_handle_update()
+
+        coordinator.cycles = 2
+        coordinator.data = _snapshot(30.0)
+        collector.async_handle_update()
+
+        collector.async_add_snapshot(_snapshot(5.0), hour_start + timedelta(hours=1))
+
+        assert import_m.call_args.args[2] == [
+            {"start": hour_start, "mean": 20.0, "min": 10.0, "max": 30.0}
+        ]
@@ -0,0 +1,256 @@
+"""Test the HTTP views of the Technische Alternative C.M.I. integration."""
+import copy
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+from ta_cmi import RateLimitError
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import DOMAIN
+from custom_components.ta_cmi.views import render_metrics
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+SNAPSHOT_URL = "/api/ta_cmi/snapshot"
+METRICS_URL = "/api/ta_cmi/metrics"
+HOST = "http://192.168.2.101"
+
+
+def _rate_limited_node(rate_limited_node: str):
+    """Create a side effect that rejects the requests to a node."""
+
+    async def get_device_data(node_id: str, parameter: str) -> dict[str, Any]:
+        if node_id == rate_limited_node:
+            raise RateLimitError("Too many requests")
+        return DUMMY_DEVICE_API_DATA
+
+    return get_device_data
+
+
+@pytest.mark.asyncio
+async def test_snapshot_view(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    hass_client_no_auth: ClientSessionGenerator,
+) -> None:
+    """Test that the latest data is served with validators for caching."""
+    api_data: dict[str, Any] = copy.deepcopy(DUMMY_DEVICE_API_DATA)
+
+    async def get_device_data(node_id: str, parameter: str) -> dict[str, Any]:
+        return copy.deepcopy(api_data)
+
+    assert await async_setup_component(hass, "http", {})
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", side_effect=get_device_data
+    ) as get_device_data_mock, patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+        requests: int = get_device_data_mock.call_count
+
+        client = await hass_client()
+
+        response = await client.get(SNAPSHOT_URL, params={"host": HOST, "node": "2"})
+
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Last-Modified"]
+
+        etag: str = response.headers["ETag"]
+        data = await response.json()
+
+        assert list(data["nodes"]) == ["2"]
+        assert data["nodes"]["2"]["available"]
+        assert data["nodes"]["2"]["device_type"] == "UVR16x2"
+        assert data["nodes"]["2"]["channels"]["sensor"]["INPUT"]["1"] == [
+            92.2,
+            "°C",
+            "Input 1",
+        ]
+
+        response = await client.get(
+            SNAPSHOT_URL,
+            params={"host": HOST, "node": "2"},
+            headers={"If-None-Match": etag},
+        )
+
+        assert response.status == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+        response = await client.get(
+            SNAPSHOT_URL,
+            params={"host": HOST, "node": "2"},
+            headers={"If-Modified-Since": response.headers["Last-Modified"]},
+        )
+
+        assert response.status == HTTPStatus.NOT_MODIFIED
+        assert get_device_data_mock.call_count == requests
+
+        api_data["Data"]["Inputs"][0]["Value"]["Value"] = 93.0
+        await coordinator.async_refresh()
+
+        response = await client.get(
+            SNAPSHOT_URL,
+            params={"host": HOST, "node": "2"},
+            headers={"If-None-Match": etag},
+        )
+
+        assert response.status == HTTPStatus.OK
+        assert response.headers["ETag"] != etag
+        assert (await response.json())["nodes"]["2"]["channels"]["sensor"]["INPUT"][
+            "1"
+        ][0] == 93.0
+
+        response = await client.get(SNAPSHOT_URL, params={"host": HOST})
+
+        assert response.status == HTTPStatus.OK
+        assert list((await response.json())["nodes"]) == ["2", "5"]
+
+        response = await client.get(SNAPSHOT_URL, params={"host": "192.168.2.102"})
+
+        assert response.status == HTTPStatus.NOT_FOUND
+
+        client = await hass_client_no_auth()
+        response = await client.get(SNAPSHOT_URL, params={"host": HOST})
+
+        assert response.status == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_metrics_view(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test that the channels and the update health are rendered for Prometheus."""
+    assert await async_setup_component(hass, "http", {})
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        client = await hass_client()
+        response = await client.get(METRICS_URL)
+
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+
+        lines: list[str] = (await response.text()).splitlines()
+
+        assert "# TYPE ta_cmi_channel_value gauge" in lines
+        assert (
+            'ta_cmi_channel_value{host="http://192.168.2.101",node="2",'
+            'entity_type="sensor",channel_type="INPUT",channel="1",'
+            'name="Input 1",unit="°C"} 92.2'
+        ) in lines
+        assert (
+            'ta_cmi_channel_value{host="http://192.168.2.101",node="2",'
+            'entity_type="binary",channel_type="OUTPUT",channel="1",'
+            'name="Output 1",unit=""} 1'
+        ) in lines
+        assert 'ta_cmi_up{host="http://192.168.2.101"} 1' in lines
+        assert 'ta_cmi_cycles_total{host="http://192.168.2.101"} 1' in lines
+        assert (
+            'ta_cmi_node_rate_limit_hits_total{host="http://192.168.2.101",node="5"} 0'
+        ) in lines
+
+        with patch(
+            "custom_components.ta_cmi.views.render_metrics", wraps=render_metrics
+        ) as render_mock:
+            await client.get(METRICS_URL)
+
+            assert render_mock.call_count == 0
+
+            with patch(
+                "ta_cmi.cmi_api.CMIAPI.get_device_data",
+                side_effect=_rate_limited_node("5"),
+            ):
+                await coordinator.async_refresh()
+
+            response = await client.get(METRICS_URL)
+
+            assert render_mock.call_count == 1
+
+        lines = (await response.text()).splitlines()
+
+        assert 'ta_cmi_cycles_total{host="http://192.168.2.101"} 2' in lines
+        assert (
+            'ta_cmi_node_rate_limit_hits_total{host="http://192.168.2.101",node="5"} 1'
+        ) in lines
+        assert 'ta_cmi_node_available{host="http://192.168.2.101",node="5"} 0' in lines
+
+        # A refreshed node only changes its availability if its data is the same.
+        with patch(
+            "custom_components.ta_cmi.views.render_metrics", wraps=render_metrics
+        ) as render_mock:
+            coordinator.async_request_node_refresh("5")
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+            response = await client.get(METRICS_URL)
+
+            assert render_mock.call_count == 1
+
+        lines = (await response.text()).splitlines()
+
+        assert 'ta_cmi_node_available{host="http://192.168.2.101",node="5"} 1' in lines
+
+
+@pytest.mark.asyncio
+async def test_views_unloaded_entry(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test that an unloaded C.M.I. is not served anymore."""
+    assert await async_setup_component(hass, "http", {})
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        client = await hass_client()
+
+        assert HOST in await (await client.get(METRICS_URL)).text()
+
+        await hass.config_entries.async_unload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert HOST not in await (await client.get(METRICS_URL)).text()
+
+        response = await client.get(SNAPSHOT_URL, params={"host": HOST})
+
+        assert response.status == HTTPStatus.NOT_FOUND
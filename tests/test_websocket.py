@@ -0,0 +1,152 @@
+"""Test the websocket API of the Technische Alternative C.M.I. integration."""
+import copy
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.ta_cmi import CMIDataUpdateCoordinator
+from custom_components.ta_cmi.const import DOMAIN
+
+from . import sleep_mock
+from .test_sensor import DUMMY_DEVICE_API_DATA, ENTRY_DATA
+
+
+@pytest.mark.asyncio
+async def test_subscribe(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test that the channels are sent once and then only the changes."""
+    api_data: dict[str, Any] = copy.deepcopy(DUMMY_DEVICE_API_DATA)
+
+    async def get_device_data(node_id: str, parameter: str) -> dict[str, Any]:
+        return copy.deepcopy(api_data)
+
+    assert await async_setup_component(hass, "websocket_api", {})
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", side_effect=get_device_data
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        client = await hass_ws_client(hass)
+
+        await client.send_json_auto_id(
+            {"type": "ta_cmi/subscribe", "host": "http://192.168.2.101", "node": "2"}
+        )
+        msg = await client.receive_json()
+
+        assert msg["success"]
+
+        msg = await client.receive_json()
+        event = msg["event"]
+
+        assert event["full"]
+        assert event["version"] == coordinator.data.version
+        assert list(event["nodes"]) == ["2"]
+        assert event["nodes"]["2"]["available"]
+        assert event["nodes"]["2"]["channels"]["sensor"]["INPUT"]["1"] == [
+            92.2,
+            "°C",
+            "Input 1",
+        ]
+        assert event["nodes"]["2"]["channels"]["binary"]["OUTPUT"]["1"][0] == "on"
+
+        api_data["Data"]["Inputs"][0]["Value"]["Value"] = 93.0
+
+        await coordinator.async_refresh()
+
+        msg = await client.receive_json()
+
+        assert msg["event"] == {
+            "version": coordinator.data.version,
+            "nodes": {
+                "2": {"channels": {"sensor": {"INPUT": {"1": [93.0, "°C", "Input 1"]}}}}
+            },
+        }
+
+        await client.send_json_auto_id(
+            {"type": "ta_cmi/subscribe", "host": "http://192.168.2.102"}
+        )
+        msg = await client.receive_json()
+
+        assert not msg["success"]
+        assert msg["error"]["code"] == "not_found"
+
+
+@pytest.mark.asyncio
+async def test_subscribe_entry_reload(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test that the subscription ends with an error when the entry is reloaded."""
+    assert await async_setup_component(hass, "websocket_api", {})
+
+    with patch(
+        "ta_cmi.cmi_api.CMIAPI.get_device_data", return_value=DUMMY_DEVICE_API_DATA
+    ), patch("asyncio.sleep", wraps=sleep_mock), patch.object(
+        CMIDataUpdateCoordinator, "_coe_sleep_function", sleep_mock
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="NINA", data=ENTRY_DATA
+        )
+
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: CMIDataUpdateCoordinator = hass.data[DOMAIN][conf_entry.entry_id]
+
+        client = await hass_ws_client(hass)
+
+        await client.send_json_auto_id(
+            {"type": "ta_cmi/subscribe", "host": "http://192.168.2.101"}
+        )
+        subscription_id: int = (await client.receive_json())["id"]
+        await client.receive_json()
+
+        await hass.config_entries.async_reload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        msg = await client.receive_json()
+
+        assert msg["id"] == subscription_id
+        assert not msg["success"]
+        assert msg["error"]["code"] == "not_found"
+        assert not coordinator._listeners
+
+        await client.send_json_auto_id(
+            {"type": "ta_cmi/subscribe", "host": "http://192.168.2.101"}
+        )
+        msg = await client.receive_json()
+
+        assert msg["success"]
+        assert (await client.receive_json())["event"]["full"]
+
+        await hass.config_entries.async_unload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert not (await client.receive_json())["success"]
+
+        await client.send_json_auto_id(
+            {"type": "ta_cmi/subscribe", "host": "http://192.168.2.101"}
+        )
+        msg = await client.receive_json()
+
+        assert not msg["success"]
+        assert msg["error"]["code"] == "not_found"